@@ -0,0 +1,55 @@
+# Times markdown_to_blocks on 1 MB and 10 MB documents to check that block splitting scales linearly.
+# Run from src/: python3 -m benchmarks.bench_blocks
+import gc
+import time
+
+from main import markdown_to_blocks
+
+SECTION = """## Release notes
+
+This release fixes several bugs and improves **performance** of the `build` step.
+See the [changelog](/changelog) for details.
+
+* Faster block splitting
+* Fewer allocations
+- Unrelated list
+
+1. First step
+2. Second step
+
+> Quoted remark
+> spanning two lines
+
+```python
+def hello():
+    return "world"
+```
+
+"""
+
+def make_markdown(size):
+    repeats = size // len(SECTION) + 1
+    return "# Changelog\n\n" + SECTION * repeats
+
+def time_blocks(markdown, rounds=3):
+    best = None
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        blocks = markdown_to_blocks(markdown)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(blocks)
+
+def main():
+    results = []
+    for size_mb in (1, 10):
+        markdown = make_markdown(size_mb * 1024 * 1024)
+        elapsed, block_count = time_blocks(markdown)
+        results.append((size_mb, elapsed))
+        print(f"{size_mb:>3} MB: {block_count} blocks in {elapsed:.3f}s ({size_mb / elapsed:.1f} MB/s)")
+    (small_mb, small_time), (large_mb, large_time) = results
+    print(f"Scaling: {large_mb // small_mb}x input took {large_time / small_time:.1f}x time (linear is ~{large_mb // small_mb}x)")
+
+if __name__ == "__main__":
+    main()
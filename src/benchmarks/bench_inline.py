@@ -0,0 +1,38 @@
+# Compares inline parsing throughput of text_to_textnodes against the split_nodes_* chain it replaced.
+# Run from src/: python3 -m benchmarks.bench_inline
+import time
+
+from main import text_to_textnodes, split_nodes_link, split_nodes_image, split_nodes_delimiter
+from textnode import TextNode, TextType
+
+INPUTS = {
+    "prose": "This is **bold** text with an _italic_ word, some `code` and a [link](https://boot.dev). " * 200,
+    "links": "See [docs](/docs) and ![logo](/images/logo.png) or [home](/). " * 200,
+    "unmatched": "snake_case_name and another_one " * 200,
+}
+
+def chain_text_to_textnodes(text):
+    nodes = split_nodes_link([TextNode(text, TextType.NORMAL)])
+    nodes = split_nodes_image(nodes)
+    return split_nodes_delimiter(nodes)
+
+def chars_per_second(function, text, min_time=0.5):
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        function(text)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return len(text) * rounds / elapsed
+
+def main():
+    print(f"{'input':<10} {'chars':>8} {'chain chars/s':>15} {'scanner chars/s':>16} {'speedup':>8}")
+    for name, text in INPUTS.items():
+        assert text_to_textnodes(text) == chain_text_to_textnodes(text)
+        chain_rate = chars_per_second(chain_text_to_textnodes, text)
+        scanner_rate = chars_per_second(text_to_textnodes, text)
+        print(f"{name:<10} {len(text):>8} {chain_rate:>15,.0f} {scanner_rate:>16,.0f} {scanner_rate / chain_rate:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
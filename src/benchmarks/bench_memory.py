@@ -0,0 +1,85 @@
+# Reports bytes per node and peak memory per page for the slotted node classes
+# against plain __dict__-based classes laid out like the originals.
+# Run from src/: python3 -m benchmarks.bench_memory
+import tracemalloc
+
+import main
+from textnode import TextNode, TextType
+from htmlnode import HTMLNode
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+class DictTextNode ():
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class DictHTMLNode ():
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children or []
+        self.props = props
+
+    props_to_html = HTMLNode.props_to_html
+    html_parts = HTMLNode.html_parts
+    iter_html = HTMLNode.iter_html
+    to_html = HTMLNode.to_html
+
+class DictLeafNode (DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, None, props)
+
+    html_parts = LeafNode.html_parts
+    to_html = LeafNode.to_html
+
+class DictParentNode (DictHTMLNode):
+    def __init__(self, tag=None, children=None, props=None):
+        self.tag = tag
+        self.children = children or []
+        self.props = props
+
+    html_parts = ParentNode.html_parts
+
+CLASSES = {
+    "dict": (DictTextNode, DictLeafNode, DictParentNode),
+    "slots": (TextNode, LeafNode, ParentNode),
+}
+
+PAGE = "# Reference\n\n" + "A paragraph with **bold**, _italic_, `code` and a [link](/docs).\n\n* one\n* two **three**\n\n" * 2000
+
+def bytes_per_node(factory, count=20000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(nodes)
+
+def page_peak(classes):
+    saved = (main.TextNode, main.LeafNode, main.ParentNode)
+    main.TextNode, main.LeafNode, main.ParentNode = classes # The parser looks these names up at call time.
+    try:
+        tracemalloc.start()
+        html = main.markdown_to_html_node(PAGE).to_html()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        main.TextNode, main.LeafNode, main.ParentNode = saved
+    return peak, len(html)
+
+def main_bench():
+    print(f"{'layout':<6} {'TextNode':>9} {'LeafNode':>9} {'ParentNode':>11} {'page peak':>12}")
+    results = {}
+    for layout, (text_cls, leaf_cls, parent_cls) in CLASSES.items():
+        text_size = bytes_per_node(lambda: text_cls("text", TextType.NORMAL))
+        leaf_size = bytes_per_node(lambda: leaf_cls("b", "text"))
+        parent_size = bytes_per_node(lambda: parent_cls("p", None))
+        peak, html_size = page_peak((text_cls, leaf_cls, parent_cls))
+        results[layout] = peak
+        print(f"{layout:<6} {text_size:>8.0f}B {leaf_size:>8.0f}B {parent_size:>10.0f}B {peak / 1024:>10.0f}KB")
+    print(f"Page of {len(PAGE)} chars ({html_size} chars of HTML): peak memory {results['slots'] / results['dict']:.0%} of the dict layout")
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,144 @@
+# End-to-end build benchmark with a regression gate.
+# Generates synthetic content/ trees, runs the full main() pipeline on each in a
+# fresh process, and compares wall time, pages/sec, peak RSS and output bytes
+# against a stored baseline. Exits with status 1 when a metric regresses past
+# the threshold. If the baseline file doesn't exist yet, it is created; it holds
+# this machine's numbers, so it is gitignored rather than committed.
+# Run from src/: python3 -m benchmarks.bench_site [--pages 1000 10000] [--threshold 0.1]
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.inputs import mixed_document, long_paragraph, long_list
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(SRC_DIR)
+DEFAULT_BASELINE = os.path.join(SRC_DIR, "benchmarks", "site_baseline.json")
+
+METRICS = { # Metric name and whether a larger value is worse.
+    "seconds": True,
+    "pages_per_second": False,
+    "peak_rss_kb": True,
+    "output_bytes": True,
+    "noop_seconds": True,
+}
+
+# Runs inside the build process so that peak RSS covers exactly one build. With
+# --jobs the pages are rendered in worker processes, which RUSAGE_SELF never sees;
+# they are joined before main() returns, so RUSAGE_CHILDREN holds the largest one.
+BUILD_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+import main
+start = time.perf_counter()
+main.main(sys.argv[2:])
+elapsed = time.perf_counter() - start
+peak_rss_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+print(json.dumps({"seconds": elapsed, "peak_rss_kb": peak_rss_kb}))
+"""
+
+def page_size(rng): # Log-normal around 3 KB with a long tail of big reference pages.
+    return int(min(rng.lognormvariate(8.0, 1.0), 200_000))
+
+def generate_site(site_dir, page_count, seed=0):
+    rng = random.Random(seed)
+    shutil.copytree(os.path.join(REPO_DIR, "static"), os.path.join(site_dir, "static"))
+    shutil.copy(os.path.join(REPO_DIR, "template.html"), os.path.join(site_dir, "template.html"))
+    generators = [mixed_document, mixed_document, mixed_document, long_paragraph, long_list]
+    for i in range(page_count):
+        page_dir = os.path.join(site_dir, "content", f"section-{i % 100:02d}", f"page-{i:06d}")
+        os.makedirs(page_dir)
+        body = rng.choice(generators)(page_size(rng))
+        with open(os.path.join(page_dir, "index.md"), "w") as f:
+            f.write(f"# Page {i}\n\n{body}\n")
+
+def run_build(site_dir, build_args):
+    output = subprocess.run(
+        [sys.executable, "-c", BUILD_SCRIPT, SRC_DIR, *build_args],
+        cwd=site_dir, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def directory_bytes(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def measure(page_count, build_args):
+    with tempfile.TemporaryDirectory() as site_dir:
+        generate_site(site_dir, page_count)
+        cold = run_build(site_dir, build_args)
+        noop = run_build(site_dir, build_args)
+        return {
+            "seconds": cold["seconds"],
+            "pages_per_second": page_count / cold["seconds"],
+            "peak_rss_kb": cold["peak_rss_kb"],
+            "output_bytes": directory_bytes(os.path.join(site_dir, "docs")),
+            "noop_seconds": noop["seconds"],
+        }
+
+def find_regressions(results, baseline, threshold): # A size missing from the baseline counts too; passing after comparing nothing would hide it.
+    regressions = []
+    for pages, metrics in results.items():
+        if pages not in baseline:
+            regressions.append(f"{pages} pages: not in the baseline, record it with --update-baseline")
+            continue
+        for name, larger_is_worse in METRICS.items():
+            old = baseline[pages].get(name)
+            new = metrics[name]
+            if not old:
+                continue
+            change = (new - old) / old if larger_is_worse else (old - new) / old
+            if change > threshold:
+                regressions.append(f"{pages} pages: {name} {old:.4g} -> {new:.4g} ({change:+.0%} worse)")
+    return regressions
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="End-to-end build benchmark with a regression gate.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 10000, 100000], help="site sizes to build")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed fractional regression per metric (default: 0.10)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run's results in the baseline, keeping the sizes it didn't measure")
+    parser.add_argument("--build-args", default="", help="extra arguments passed to main.py, e.g. '--jobs 8'")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = {}
+    for page_count in args.pages:
+        start = time.perf_counter()
+        results[str(page_count)] = measure(page_count, args.build_args.split())
+        metrics = results[str(page_count)]
+        print(f"{page_count:>7} pages: {metrics['seconds']:.2f}s ({metrics['pages_per_second']:.0f} pages/s), "
+              f"peak RSS {metrics['peak_rss_kb'] / 1024:.0f} MB, output {metrics['output_bytes'] / 1e6:.1f} MB, "
+              f"no-op rebuild {metrics['noop_seconds']:.2f}s [total {time.perf_counter() - start:.0f}s]")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.update_baseline or not baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        return 1
+    print(f"No metric regressed by more than {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# Per-stage microbenchmarks over synthetic and pathological inputs.
+# Times each parser stage at several input sizes, fits a scaling exponent
+# (1.0 is linear, 2.0 quadratic) and prints the results as JSON.
+# Run from src/: python3 -m benchmarks.bench_stages [--output stages.json] [--max-exponent 1.5]
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+from main import markdown_to_blocks, block_to_block_type, text_to_textnodes, split_nodes_delimiter, \
+    extract_markdown_links, extract_markdown_images, markdown_to_html_node
+from textnode import TextNode, TextType
+from benchmarks.inputs import INLINE_INPUTS, DOCUMENT_INPUTS
+
+def prepare_to_html(text):
+    node = markdown_to_html_node(text)
+    return node.to_html
+
+STAGES = { # Maps each stage to (inputs, setup); setup turns the input text into a zero-argument callable.
+    "markdown_to_blocks": (DOCUMENT_INPUTS, lambda text: lambda: markdown_to_blocks(text)),
+    "block_to_block_type": (DOCUMENT_INPUTS, lambda text: lambda: [block_to_block_type(block) for block in markdown_to_blocks(text)]),
+    "text_to_textnodes": (INLINE_INPUTS, lambda text: lambda: text_to_textnodes(text)),
+    "split_nodes_delimiter": (INLINE_INPUTS, lambda text: lambda: split_nodes_delimiter([TextNode(text, TextType.NORMAL)])),
+    "extract_markdown_links": (INLINE_INPUTS, lambda text: lambda: extract_markdown_links(text)),
+    "extract_markdown_images": (INLINE_INPUTS, lambda text: lambda: extract_markdown_images(text)),
+    "to_html": (DOCUMENT_INPUTS, prepare_to_html),
+}
+
+def time_call(function, min_time):
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / rounds
+
+def scaling_exponent(points): # Least-squares slope of log(time) against log(size).
+    xs = [math.log(point["size"]) for point in points]
+    ys = [math.log(max(point["seconds"], 1e-12)) for point in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+def run_stage(stage, input_name, generator, setup, sizes, min_time):
+    points = []
+    for size in sizes:
+        text = generator(size)
+        function = setup(text)
+        try:
+            seconds = time_call(function, min_time)
+        except Exception as e: # Some inputs are invalid for some stages; record it instead of aborting the suite.
+            return {"stage": stage, "input": input_name, "error": f"{type(e).__name__}: {e}"[:200]}
+        points.append({"size": len(text), "seconds": seconds, "chars_per_second": len(text) / seconds})
+    return {"stage": stage, "input": input_name, "points": points, "exponent": scaling_exponent(points)}
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Per-stage parser microbenchmarks with scaling curves.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 4000, 8000, 16000], help="input sizes in characters")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds to spend timing each point")
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="only run these stages")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--max-exponent", type=float, help="exit with status 1 if any stage scales worse than this")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = []
+    for stage in args.stage or STAGES:
+        inputs, setup = STAGES[stage]
+        for input_name, generator in inputs.items():
+            result = run_stage(stage, input_name, generator, setup, args.sizes, args.min_time)
+            results.append(result)
+            exponent = result.get("exponent")
+            summary = f"exponent {exponent:.2f}" if exponent is not None else result.get("error", "")
+            print(f"{stage:<24} {input_name:<22} {summary}", file=sys.stderr)
+
+    report = {"python": platform.python_version(), "sizes": args.sizes, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.max_exponent is not None:
+        slow = [result for result in results if (result.get("exponent") or 0) > args.max_exponent]
+        for result in slow:
+            print(f"Superlinear: {result['stage']} on {result['input']} (exponent {result['exponent']:.2f})", file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
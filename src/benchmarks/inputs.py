@@ -0,0 +1,54 @@
+# Synthetic markdown generators for the benchmarks. Each generator takes a
+# target size in characters and returns text of roughly that size, built
+# from the shapes that have caused slow builds before.
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "build", "static", "site", "generator", "page"]
+
+def repeat_to_size(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+def words(count):
+    return " ".join(WORDS[i % len(WORDS)] for i in range(count))
+
+def long_paragraph(size): # One paragraph of prose with light formatting.
+    return repeat_to_size(f"{words(12)} **bold** {words(8)} _italic_ {words(6)} `code`. ", size)
+
+def deep_emphasis(size): # Long runs of nested bold and italic spans.
+    depth = max(1, size // 24)
+    return "**a _b " * depth + "text" + " c_ d**" * depth
+
+def many_links(size): # Hundreds of links and images on a single line.
+    return repeat_to_size("see [the docs](/docs/page) and ![a logo](/images/logo.png) ", size)
+
+def unmatched_delimiters(size): # Closed pairs followed by a "_" and "`" that never close, so every closing search runs to the end.
+    half = size // 2
+    return repeat_to_size("**bold** * star ", half) + " _ ` " + repeat_to_size("snake__case ", size - half)
+
+def huge_code_fence(size): # A single fenced code block.
+    body = repeat_to_size("    print('hello world')  # comment\n", size)
+    return f"```python\n{body}\n```"
+
+def long_list(size): # A single unordered list with one item per line.
+    return repeat_to_size(f"* item with **bold** and `code` {words(4)}\n", size).rstrip("\n").rsplit("\n", 1)[0]
+
+def mixed_document(size): # Headings, paragraphs, lists, quotes and code, like a real page.
+    section = (
+        f"## Section\n\n{words(30)} **bold** and a [link](/page).\n\n"
+        f"* one {words(3)}\n* two `code`\n\n1. first\n2. second\n\n"
+        f"> quoted {words(6)}\n\n```\ncode line\n```\n\n"
+    )
+    return "# Title\n\n" + section * (size // len(section) + 1)
+
+INLINE_INPUTS = {
+    "long_paragraph": long_paragraph,
+    "deep_emphasis": deep_emphasis,
+    "many_links": many_links,
+    "unmatched_delimiters": unmatched_delimiters,
+}
+
+DOCUMENT_INPUTS = {
+    "mixed_document": mixed_document,
+    "long_list": long_list,
+    "huge_code_fence": huge_code_fence,
+    "long_paragraph": long_paragraph,
+}
@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+class BlockMemo (): # Sizes are counted in characters, which is bytes for the ASCII most pages are made of.
+    def __init__(self, max_entries=4096, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 64 # Bigger blocks are rendered every time; one would crowd out many small ones that are far more likely to repeat.
+        self.entries = OrderedDict() # Key -> (html, size), least recently used first.
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def fits(self, size): # Lets callers skip building a key for a block that would never be kept.
+        return size <= self.max_entry_bytes
+
+    def get(self, key): # Returns the rendered HTML for `key`, or None on a miss.
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, html, size=None): # `size` is everything the entry keeps alive, including its key; the HTML alone by default.
+        if size is None:
+            size = len(html)
+        if not self.fits(size):
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.entries[key] = (html, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"BlockMemo(entries={len(self.entries)}, max_entries={self.max_entries}, size={self.size}, max_bytes={self.max_bytes}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,118 @@
+import re
+from bisect import bisect_right
+from enum import Enum
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+NEEDS_STRIPPING_PATTERN = re.compile(r"\s\n|\n\s") # Whitespace around a line break, which a paragraph's text drops.
+
+class BlockNode ():
+    def __init__(self, text, block_type, lines=None, level=0, start=None, end=None):
+        self._text = text
+        self.block_type = block_type
+        self._lines = lines # Split from the text on first use if the scanner didn't already have them.
+        self.level = level # Heading level, 0 for every other block type.
+        self.start = start # Offsets of the block in the source markdown.
+        self.end = end
+        self.source = None # Set for scanned blocks, whose text is only sliced out of the source when first needed.
+        self.base = 0 # Offset of `source` in the whole document, when it's one window of it.
+        self.form = block_type # The branch of the scanner that delimited the block, which decides how its text is derived.
+
+    @classmethod
+    def from_span(cls, source, block_type, start, end, level=0, form=None, base=0): # `start` and `end` index into `source`.
+        node = cls(None, block_type, None, level, base + start, base + end)
+        node.source = source
+        node.base = base
+        node.form = form or block_type
+        return node
+
+    def span(self): # (string, start, end) holding the block's source text, for slicing without copying the block first.
+        if self.source is None:
+            return self._text, 0, len(self._text)
+        return self.source, self.start - self.base, self.end - self.base
+
+    @property
+    def raw(self): # The block exactly as it appears in the source.
+        source, start, end = self.span()
+        return source[start:end]
+
+    @property
+    def text(self): # The block with the scanner's normalization applied, as the inline parser sees it.
+        if self._text is None:
+            form = self.form
+            if form is BlockType.CODE or form is BlockType.UNORDERED_LIST or form is BlockType.ORDERED_LIST:
+                raw = self.raw
+                self._text = raw if form is BlockType.CODE or not raw[-1].isspace() else "\n".join(self.lines) # List lines are kept as they are, except the very end.
+            elif form is BlockType.HEADING:
+                source, start, end = self.span()
+                self._text = f"{'#' * self.level} {source[start + self.level:end].strip()}"
+            elif form is BlockType.PARAGRAPH:
+                raw = self.raw
+                self._text = raw if not raw[-1].isspace() and not NEEDS_STRIPPING_PATTERN.search(raw) else "\n".join(self.lines) # Most paragraphs need no stripping, so the slice is the text.
+            else:
+                self._text = "\n".join(self.lines)
+        return self._text
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            form = self.form
+            if self.source is None or form is BlockType.CODE or form is BlockType.HEADING:
+                self._lines = self.text.split("\n")
+            elif form is BlockType.QUOTE:
+                self._lines = [line.strip() for line in self.raw.split("\n")]
+            elif form is BlockType.PARAGRAPH:
+                self._lines = [line for line in (line.strip() for line in self.raw.split("\n")) if line] # Blank lines don't end a paragraph, but aren't part of it either.
+            else:
+                lines = self.raw.split("\n")
+                lines[-1] = lines[-1].rstrip()
+                self._lines = lines
+        return self._lines
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):  # Ensure types match
+            return False
+        return self.text == other.text and \
+            self.block_type == other.block_type and \
+            self.lines == other.lines and \
+            self.level == other.level and \
+            self.start == other.start and \
+            self.end == other.end
+
+    def __repr__(self):
+        return f"BlockNode({self.text!r}, {self.block_type}, level={self.level}, start={self.start}, end={self.end})"
+
+class LineIndex (): # Maps offsets in a document to 1-based line numbers, from line starts found in one pass.
+    def __init__(self, text):
+        starts = [0]
+        newline_index = text.find("\n")
+        while newline_index != -1:
+            starts.append(newline_index + 1)
+            newline_index = text.find("\n", newline_index + 1)
+        self.starts = starts
+
+    def line_number(self, offset):
+        return bisect_right(self.starts, offset)
+
+class MarkdownError (ValueError): # A parse error tied to an offset in the source, reported with its line number once known.
+    def __init__(self, message, offset, line=None):
+        super().__init__(message)
+        self.message = message
+        self.offset = offset
+        self.line = line
+
+    def locate(self, markdown): # Fills in the line number from the document the offset points into.
+        if self.line is None and self.offset is not None:
+            self.line = LineIndex(markdown).line_number(self.offset)
+        return self
+
+    def __str__(self):
+        if self.line is None:
+            return self.message
+        return f"{self.message} (line {self.line})"
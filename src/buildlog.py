@@ -0,0 +1,29 @@
+import sys
+
+QUIET = 0 # Errors only.
+NORMAL = 1 # Errors plus a summary line per build.
+VERBOSE = 2 # Everything, including a line per file.
+
+class BuildLog ():
+    def __init__(self, level=NORMAL, out=None, err=None):
+        self.out = out # None means whatever sys.stdout/sys.stderr are at write time.
+        self.err = err
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        self.normal = level >= NORMAL # Hot paths check these flags before building a message, so a disabled line costs one attribute lookup.
+        self.verbose = level >= VERBOSE
+
+    def info(self, message):
+        if self.normal:
+            (self.out or sys.stdout).write(f"{message}\n")
+
+    def detail(self, message):
+        if self.verbose:
+            (self.out or sys.stdout).write(f"{message}\n")
+
+    def error(self, message): # Shown at every level.
+        (self.err or sys.stderr).write(f"{message}\n")
+
+log = BuildLog() # Shared by every module; main() sets the level from the command line.
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+PHASES = ("stage", "discovery", "check", "read", "cache", "blocks", "inline", "render", "template", "write", "static", "compress", "swap")
+
+class BuildTimer ():
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {} # Phase name -> [span count, total seconds, longest span].
+        self.pages = {} # Source path -> {phase: seconds}.
+        self.counters = {} # Event name -> count, e.g. cache hits.
+
+    @contextmanager
+    def span(self, phase, page=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start, page)
+
+    def add(self, phase, seconds, page=None):
+        totals = self.phases.get(phase)
+        if totals is None:
+            totals = self.phases[phase] = [0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += seconds
+        if seconds > totals[2]:
+            totals[2] = seconds
+        if page is not None:
+            page_phases = self.pages.setdefault(page, {})
+            page_phases[phase] = page_phases.get(phase, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, spans, page=None, counters=None): # Folds in (phase, seconds) pairs measured elsewhere, e.g. in a worker process.
+        for phase, seconds in spans:
+            self.add(phase, seconds, page)
+        for name, amount in (counters or {}).items():
+            self.count(name, amount)
+
+    def spans(self): # Flattens the recorded spans so they can be sent back from a worker process.
+        return [(phase, seconds) for phase_times in self.pages.values() for phase, seconds in phase_times.items()]
+
+    def phase_seconds(self, phase):
+        return self.phases.get(phase, (0, 0.0, 0.0))[1]
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def slowest_pages(self, count):
+        totals = [(sum(phases.values()), page) for page, phases in self.pages.items()]
+        totals.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"page": page, "seconds": seconds, "phases": self.pages[page]}
+            for seconds, page in totals[:count]
+        ]
+
+    def report(self, slowest=10):
+        order = {phase: i for i, phase in enumerate(PHASES)} # Known phases in pipeline order, anything else after them.
+        return {
+            "wall_seconds": self.elapsed(),
+            "pages": len(self.pages),
+            "phases": {
+                phase: {"count": count, "seconds": seconds, "max_seconds": longest}
+                for phase, (count, seconds, longest) in sorted(self.phases.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_pages": self.slowest_pages(slowest),
+        }
+
+    def write_json(self, path, slowest=10):
+        write_atomic(path, json.dumps(self.report(slowest), indent=1) + "\n")
+
+    def write_prometheus(self, path): # Textfile collector format; the file is swapped in whole so a scrape never sees half of it.
+        lines = [
+            "# HELP ssg_build_duration_seconds Wall time of the last build.",
+            "# TYPE ssg_build_duration_seconds gauge",
+            f"ssg_build_duration_seconds {self.elapsed():.6f}",
+            "# HELP ssg_build_pages Pages rendered by the last build.",
+            "# TYPE ssg_build_pages gauge",
+            f"ssg_build_pages {len(self.pages)}",
+            "# HELP ssg_build_phase_seconds Time spent in each build phase, summed over all spans.",
+            "# TYPE ssg_build_phase_seconds gauge",
+        ]
+        report = self.report(0)
+        for phase, totals in report["phases"].items():
+            lines.append(f'ssg_build_phase_seconds{{phase="{phase}"}} {totals["seconds"]:.6f}')
+        lines.append("# HELP ssg_build_phase_spans Number of spans recorded for each build phase.")
+        lines.append("# TYPE ssg_build_phase_spans gauge")
+        for phase, totals in report["phases"].items():
+            lines.append(f'ssg_build_phase_spans{{phase="{phase}"}} {totals["count"]}')
+        if self.counters:
+            lines.append("# HELP ssg_build_events Events counted during the last build, e.g. cache hits.")
+            lines.append("# TYPE ssg_build_events gauge")
+            for name, amount in sorted(self.counters.items()):
+                lines.append(f'ssg_build_events{{event="{name}"}} {amount}')
+        write_atomic(path, "\n".join(lines) + "\n")
+
+def write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+
+from manifest import hash_file
+
+HASH_LENGTH = 10 # Hex digits of the content hash kept in a fingerprinted name.
+HEADERS_NAME = "_headers" # Read by Netlify and Cloudflare Pages from the root of the output.
+IMMUTABLE_RULE = "Cache-Control: public, max-age=31536000, immutable"
+STABLE_NAMES = frozenset((HEADERS_NAME, "_redirects", "CNAME", ".nojekyll", "robots.txt", "favicon.ico")) # Fetched by name, never through a link we could rewrite.
+STABLE_EXTENSIONS = frozenset((".html", ".htm", ".txt", ".xml", ".webmanifest"))
+
+def fingerprint_name(relative_path, file_hash): # images/tom.png -> images/tom.<hash>.png
+    root, ext = os.path.splitext(relative_path)
+    return f"{root}.{file_hash[:HASH_LENGTH]}{ext}"
+
+def is_fingerprinted(relative_path):
+    name = os.path.basename(relative_path)
+    return name not in STABLE_NAMES and os.path.splitext(name)[1].lower() not in STABLE_EXTENSIONS
+
+def to_url(relative_path):
+    return "/" + relative_path.replace(os.sep, "/")
+
+class AssetMap (): # Lookup table from asset URLs to their fingerprinted URLs, built once per build.
+    def __init__(self, root, files):
+        self.root = root
+        self.files = files # Relative path -> {"hash", "size", "mtime_ns"}, kept in the build manifest.
+        self.names = {relative_path: fingerprint_name(relative_path, entry["hash"]) for relative_path, entry in files.items()}
+        self.urls = {to_url(relative_path): to_url(name) for relative_path, name in self.names.items()}
+        digest = hashlib.sha256()
+        for relative_path in sorted(files):
+            digest.update(f"{relative_path}\0{files[relative_path]['hash']}\0".encode())
+        self.digest = digest.hexdigest()
+
+    @classmethod
+    def scan(cls, root, previous=None): # Hashes the assets under root, reusing the hash from `previous` for files whose size and mtime haven't changed.
+        previous = previous or {}
+        files = {}
+        for dir_path, dirs, names in os.walk(root):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(dir_path, name)
+                relative_path = os.path.relpath(path, root)
+                if not is_fingerprinted(relative_path):
+                    continue
+                stat = os.stat(path)
+                old = previous.get(relative_path)
+                if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                    file_hash = old["hash"]
+                else:
+                    file_hash = hash_file(path)
+                files[relative_path] = {"hash": file_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        return cls(root, files)
+
+    def output_name(self, relative_path): # The fingerprinted relative path of an asset, or None if it keeps its name.
+        return self.names.get(relative_path)
+
+    def resolve(self, url): # Maps a root-relative asset URL to its fingerprinted URL, keeping any query or fragment.
+        fingerprinted = self.urls.get(url)
+        if fingerprinted is not None:
+            return fingerprinted
+        end = len(url)
+        for separator in "?#":
+            index = url.find(separator)
+            if index != -1:
+                end = min(end, index)
+        if end == len(url):
+            return url
+        fingerprinted = self.urls.get(url[:end])
+        return url if fingerprinted is None else fingerprinted + url[end:]
+
+    def headers(self): # _headers rules marking every fingerprinted URL immutable; paths are relative to the output root.
+        return "".join(f"{url}\n  {IMMUTABLE_RULE}\n" for url in sorted(self.urls.values()))
+
+    def __repr__(self):
+        return f"AssetMap(root={self.root!r}, files={len(self.files)}, digest={self.digest[:HASH_LENGTH]!r})"
+
+def write_headers(dest_path, assets, static_path=None): # Writes the rules after any hand-written static _headers file. Returns True if the file changed.
+    text = assets.headers()
+    if static_path is not None and os.path.isfile(static_path):
+        with open(static_path) as f:
+            own_rules = f.read()
+        text = own_rules + ("" if own_rules.endswith("\n") or not own_rules else "\n") + text
+    try:
+        with open(dest_path) as f:
+            if f.read() == text: # Leaves an identical file and its mtime alone.
+                return False
+    except OSError:
+        pass
+    tmp_path = f"{dest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, dest_path) # Replaced rather than rewritten, so a hardlinked static _headers is left alone.
+    return True
@@ -0,0 +1,203 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"<!--.*?-->|<!(?!--)[^>]*>|</?[A-Za-z][^>]*>", re.S) # Comments, doctypes and tags; everything between them is text.
+INCOMPLETE_PATTERN = re.compile(r"<(?:!.*|/?[A-Za-z][^>]*|/)?\Z", re.S) # A token cut off by the end of a chunk.
+START_TAG_PATTERN = re.compile(r"<([A-Za-z][^\s/>]*)((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?)*)\s*(/?)>\Z")
+ATTRIBUTE_PATTERN = re.compile(r"\s+([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+)))?")
+TAG_NAME_PATTERN = re.compile(r"</?([A-Za-z][^\s/>]*)")
+UNQUOTED_PATTERN = re.compile(r"[^\s\"'=<>`]+\Z")
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+RUN_PATTERN = re.compile(r"[\t\n\r\f]|  ") # Whitespace that collapsing would change.
+
+VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"))
+RAW_TAGS = frozenset(("pre", "textarea", "script", "style")) # Their contents are copied byte for byte.
+BLOCK_TAGS = frozenset((
+    "html", "head", "body", "title", "meta", "link", "base", "script", "style", "noscript",
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "summary", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+)) # Whitespace next to these never renders.
+P_CLOSERS = frozenset((
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset", "figcaption", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "menu", "nav", "ol", "p", "pre", "section", "table", "ul",
+)) # Start tags that close an open <p> by themselves.
+OMITTABLE_TAGS = frozenset(("li", "p", "dt", "dd", "td", "th", "tr", "option", "head", "body", "html")) # End tags that are optional in the right context.
+P_KEEPERS = frozenset(("a", "audio", "del", "ins", "map", "noscript", "video")) # Parents whose end tag doesn't close a <p> implicitly.
+
+def can_omit(end_tag, next_name, next_is_end): # Whether an end tag may be dropped given the next tag; None means end of page.
+    if next_name is None:
+        return end_tag in ("html", "body")
+    if end_tag == "li":
+        return next_is_end or next_name == "li"
+    if end_tag == "p":
+        return next_name not in P_KEEPERS if next_is_end else next_name in P_CLOSERS
+    if end_tag in ("dt", "dd"):
+        return next_name in ("dt", "dd") if not next_is_end else end_tag == "dd"
+    if end_tag in ("td", "th"):
+        return next_is_end or next_name in ("td", "th")
+    if end_tag == "tr":
+        return next_is_end or next_name == "tr"
+    if end_tag == "option":
+        return next_is_end or next_name in ("option", "optgroup")
+    if end_tag == "head":
+        return True # Whitespace after it is already gone, and comments flush it before getting here.
+    if end_tag == "body":
+        return next_is_end and next_name == "html"
+    return False
+
+def minify_start_tag(tag, name):
+    match = START_TAG_PATTERN.match(tag)
+    if match is None:
+        return tag # Not something we can take apart safely.
+    self_closing = match.group(3)
+    if self_closing and name not in VOID_TAGS: # The slash matters in SVG and MathML, and an unquoted value would swallow it.
+        return tag
+    parts = [f"<{match.group(1)}"]
+    for attribute in ATTRIBUTE_PATTERN.finditer(match.group(2)):
+        attribute_name, double_quoted, single_quoted, unquoted = attribute.groups()
+        value = next((value for value in (double_quoted, single_quoted, unquoted) if value is not None), None)
+        if value is None:
+            parts.append(f" {attribute_name}")
+        elif UNQUOTED_PATTERN.match(value):
+            parts.append(f" {attribute_name}={value}")
+        elif double_quoted is None and '"' in value:
+            parts.append(f" {attribute_name}='{value}'")
+        else:
+            parts.append(f' {attribute_name}="{value}"')
+    parts.append(">")
+    return "".join(parts)
+
+def describe_tag(tag): # (name, is_end, is_block, minified tag or None if it can be dropped) for a start or end tag.
+    is_end = tag[1] == "/"
+    name = TAG_NAME_PATTERN.match(tag).group(1).lower()
+    if not is_end:
+        minified = minify_start_tag(tag, name)
+    elif name in VOID_TAGS and name != "br": # </img> and friends are ignored by browsers; </br> is a line break.
+        minified = None
+    else:
+        minified = f"</{tag[2:-1].strip()}>"
+    return name, is_end, name in BLOCK_TAGS, minified
+
+TAG_CACHE = {} # Tag text -> describe_tag(); pages repeat the same few hundred tags.
+TAG_CACHE_SIZE = 16384
+
+class HtmlMinifier (): # Minifies HTML fed to it in arbitrary chunks, passing the result to `write` as it goes.
+    def __init__(self, write):
+        self.out = write
+        self.carry = "" # Start of a tag or comment split across chunks.
+        self.raw = None # Name of the pre/textarea/script/style element being copied verbatim.
+        self.space = False # Collapsed whitespace that is only written if something inline follows.
+        self.after_block = True # Whitespace right after a block tag (or at the start) is dropped.
+        self.end_tag = None # (name, tag) of an end tag that may be omitted, depending on what comes next.
+
+    def write(self, chunk): # File-like, so a node tree can be written straight through it.
+        if not self.carry: # Most chunks from a node tree are a single tag or plain text.
+            tag = TAG_CACHE.get(chunk)
+            if tag is not None:
+                self.tag(chunk, tag)
+                return
+            if "<" not in chunk:
+                if chunk:
+                    self.text(chunk)
+                return
+        data = self.carry + chunk if self.carry else chunk
+        pos = 0
+        for match in TOKEN_PATTERN.finditer(data):
+            start = match.start()
+            if start > pos:
+                self.text(data[pos:start])
+            token = match.group()
+            tag = TAG_CACHE.get(token)
+            if tag is not None and self.raw is None:
+                self.tag(token, tag)
+            else:
+                self.token(token)
+            pos = match.end()
+        tail = data[pos:]
+        incomplete = INCOMPLETE_PATTERN.search(tail)
+        if incomplete is None:
+            self.carry = ""
+        else:
+            self.carry = tail[incomplete.start():]
+            tail = tail[:incomplete.start()]
+        if tail:
+            self.text(tail)
+
+    def text(self, text):
+        if self.raw is not None:
+            self.out(text)
+            return
+        collapsed = WHITESPACE_PATTERN.sub(" ", text) if RUN_PATTERN.search(text) else text
+        body = collapsed.strip(" ")
+        if not body:
+            self.space = self.space or not self.after_block
+            return
+        if self.end_tag is not None:
+            self.flush_end_tag()
+        if (self.space or collapsed[0] == " ") and not self.after_block:
+            self.out(" ")
+        self.out(body)
+        self.space = collapsed[-1] == " "
+        self.after_block = False
+
+    def token(self, token):
+        if self.raw is not None:
+            self.out(token)
+            if token[1] == "/" and token[2:2 + len(self.raw)].lower() == self.raw and not token[2 + len(self.raw)].isalnum():
+                self.raw = None
+                self.after_block = True
+            return
+        if token[1] == "!": # Comment or doctype.
+            self.flush_end_tag()
+            if self.space:
+                self.out(" ")
+                self.space = False
+            self.out(token)
+            self.after_block = not token.startswith("<!--")
+            return
+        tag = TAG_CACHE.get(token)
+        if tag is None:
+            tag = describe_tag(token)
+            if len(TAG_CACHE) >= TAG_CACHE_SIZE:
+                TAG_CACHE.clear()
+            TAG_CACHE[token] = tag
+        self.tag(token, tag)
+
+    def tag(self, token, tag):
+        if self.raw is not None: # Only reachable through the single-tag shortcut in write().
+            self.token(token)
+            return
+        name, is_end, is_block, minified = tag
+        if self.end_tag is not None:
+            if not can_omit(self.end_tag[0], name, is_end):
+                self.out(self.end_tag[1])
+            self.end_tag = None
+        if self.space and not is_block:
+            self.out(" ")
+        self.space = False
+        self.after_block = is_block
+        if minified is None: # A void end tag such as </img>.
+            return
+        if is_end and name in OMITTABLE_TAGS:
+            self.end_tag = (name, minified)
+            return
+        self.out(minified)
+        if name in RAW_TAGS and not is_end:
+            self.raw = name
+
+    def flush_end_tag(self):
+        if self.end_tag is not None:
+            self.out(self.end_tag[1])
+            self.end_tag = None
+
+    def close(self): # Writes out whatever is still held back at the end of the page.
+        if self.carry:
+            carry, self.carry = self.carry, ""
+            if self.raw is not None:
+                self.out(carry)
+            else:
+                self.text(carry)
+        if self.end_tag is not None:
+            if not can_omit(self.end_tag[0], None, False):
+                self.out(self.end_tag[1])
+            self.end_tag = None
@@ -1,4 +1,6 @@
 class HTMLNode ():
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -6,30 +8,37 @@ class HTMLNode ():
         self.props = props
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def html_parts(self):
         if self.tag is None:
             # If no tag, just render children concatenated together
-            return "".join(child.to_html() for child in self.children) if self.children else ""
-    
-        # Start with opening tag
-        html = f"<{self.tag}"
-        
-        # Add any props/attributes if they exist
-        if self.props:
-            for key, value in self.props.items():
-                html += f' {key}="{value}"'
-        
-        # Close opening tag
-        html += ">"
-        
-        # Add children's HTML if they exist
-        if self.children:
-            for child in self.children:
-                html += child.to_html()
-        
-        # Add closing tag
-        html += f"</{self.tag}>"
-        
-        return html
+            return "", self.children, ""
+        # Opening tag with any props/attributes, children, closing tag
+        return f"<{self.tag}{self.props_to_html()}>", self.children, f"</{self.tag}>"
+
+    def iter_html(self):
+        # Walks the tree with an explicit stack, so deep trees don't recurse
+        # and no intermediate strings are built for subtrees
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+                continue
+            opening, children, closing = node.html_parts()
+            if opening:
+                yield opening
+            if closing:
+                stack.append(closing)
+            if children:
+                stack.extend(reversed(children))
+
+    def write_html(self, out):
+        # Accepts a file-like object or a list of chunks
+        write = out.write if hasattr(out, "write") else out.append
+        for chunk in self.iter_html():
+            write(chunk)
     
     def props_to_html(self):
         string = ""
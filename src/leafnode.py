@@ -1,10 +1,15 @@
 from htmlnode import HTMLNode
 
 class LeafNode (HTMLNode):
+    __slots__ = ()
+    children = () # Shared by every leaf instead of a list per node.
+
     def __init__(self, tag, value, props=None):
         if value is None:
             raise ValueError("LeafNode value cannot be None")
-        super().__init__(tag, value, None, props)
+        self.tag = tag
+        self.value = value
+        self.props = props
 
     def to_html(self):
         if self.tag is None:
@@ -12,7 +17,10 @@ class LeafNode (HTMLNode):
         if self.props is None:
             return f"<{self.tag}>{self.value}</{self.tag}>"
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
-        
+
+    def html_parts(self):
+        return self.to_html(), None, ""
+
     def __repr__(self):
         if self.props is None:
             return f"LeafNode(tag={self.tag!r}, value={self.value!r})"
@@ -2,11 +2,46 @@ import re
 import shutil
 import os
 import sys
+import argparse
+import time
+import mmap
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from textnode import TextNode, TextType
+from blocknode import BlockNode, BlockType, MarkdownError
 from parentnode import ParentNode
 from leafnode import LeafNode
+from manifest import BuildManifest
+from staticsync import sync_dir_contents, copy_file
+from watch import take_snapshot, diff_snapshots
+from pagetemplate import PageTemplate, rewrite_url
+from htmlminify import HtmlMinifier
+from buildtimer import BuildTimer
+from buildlog import log, QUIET, NORMAL, VERBOSE
+from rendercache import RenderCache
+from blockmemo import BlockMemo
+from pagewriter import PageWriter
+from precompress import Precompressor, remove_sidecars
+from staging import prepare_staging, swap_output, diff_output_trees, write_deploy_manifest, list_output_files
+from fingerprint import AssetMap, HEADERS_NAME, write_headers
 
-def text_node_to_html_node(text_node):
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+STREAM_THRESHOLD = 64 * 1024 * 1024 # Pages at least this many bytes are streamed from an mmap instead of read whole.
+STREAM_WINDOW = 1024 * 1024 # Bytes decoded at a time when scanning a mapped page; grows only for blocks that don't fit.
+MINIFY = False # Set from --minify; every compiled template minifies the pages it fills.
+ASSETS = None # AssetMap of the current build with --fingerprint; see open_assets(). Every compiled template resolves asset URLs through it.
+WORKER_MEMO = None # Each worker process keeps its own block memo for the whole build; see init_worker().
+WORKER_TEMPLATE = None # Handed to each worker once, so a job is only a source path; the template can carry a large AssetMap.
+WORKER_CACHE = None
+MEMO_BYTES = 16 * 1024 * 1024 # Default size budget of a block memo.
+PRECOMPRESS = None # Precompressor that written pages are handed to while a build compresses its output; see precompressing().
+TRACE = None # Parser events are appended here while tracing is on (see traced()); None keeps every trace point to a single check.
+INLINE_DELIMITERS = ((TextType.BOLD, "**"), (TextType.ITALIC, "_"), (TextType.CODE, "`")) # Same order as split_nodes_delimiter, whose duplicate ITALIC key leaves "_" as the only italic delimiter.
+
+def text_node_to_html_node(text_node, basepath=None, assets=None):
     if text_node.text_type is TextType.NORMAL:
         return LeafNode(None, text_node.text)
     if text_node.text_type is TextType.BOLD:
@@ -16,9 +51,9 @@ def text_node_to_html_node(text_node):
     if text_node.text_type is TextType.CODE:
         return LeafNode("code", text_node.text)
     if text_node.text_type is TextType.LINK:
-        return LeafNode("a", text_node.text, props={"href": text_node.url})
+        return LeafNode("a", text_node.text, props={"href": rewrite_url(text_node.url, basepath, assets)})
     if text_node.text_type is TextType.IMAGE:
-        return LeafNode("img", "", props={"src": text_node.url, "alt": text_node.text})
+        return LeafNode("img", "", props={"src": rewrite_url(text_node.url, basepath, assets), "alt": text_node.text})
     else:
         raise Exception("Invalid TextType")
     
@@ -83,11 +118,11 @@ def split_nodes_delimiter(old_nodes):
     return split_nodes
 
 def extract_markdown_images(text):
-    matches = re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    matches = IMAGE_PATTERN.findall(text)
     return matches
 
 def extract_markdown_links(text):
-    matches = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    matches = LINK_PATTERN.findall(text)
     return matches
 
 def split_nodes_image(old_nodes):
@@ -128,182 +163,277 @@ def split_nodes_link(old_nodes):
                 split_nodes.append(TextNode(remaining_text, TextType.NORMAL)) # Appends the remaining text after the loop completes.
     return split_nodes
 
-def text_to_textnodes(text):
-    nodes = split_nodes_link([TextNode(text, TextType.NORMAL)])
-    nodes = split_nodes_image(nodes)
-    final_nodes = split_nodes_delimiter(nodes)
-    return final_nodes
+def find_closing_delimiter(text, delimiter, opening_index): # Same rules as find_matching_delimiter, using str.find to jump between candidates.
+    if delimiter == "_":
+        curr_pos = opening_index + 1
+        while True:
+            curr_pos = text.find("_", curr_pos)
+            if curr_pos == -1:
+                return -1
+            if text.startswith("__", curr_pos): # Skips double underscores if using single.
+                curr_pos += 2
+                continue
+            return curr_pos
+    return text.find(delimiter, opening_index + len(delimiter))
 
-def markdown_to_blocks(markdown):
-    split_blocks = []
-    if markdown.strip() == "": # Handles empty or whitespace-only input.
-        return split_blocks
-    stripped = markdown.strip()
+def split_delimited_text(text, text_type, nodes): # Appends the same nodes split_nodes_delimiter would produce for `text`.
+    i = 0
+    pairs_found = False
+    next_pairs = {} # Caches each delimiter's (opening, closing) pair; it stays valid until `i` moves past the opening.
+    while i < len(text):
+        best_pair = None
+        for delim_type, delim_str in INLINE_DELIMITERS:
+            pair = next_pairs.get(delim_str)
+            if pair is None or 0 <= pair[0] < i:
+                opening_index = text.find(delim_str, i)
+                closing_index = -1 if opening_index == -1 else find_closing_delimiter(text, delim_str, opening_index)
+                pair = next_pairs[delim_str] = (opening_index, closing_index)
+            opening_index, closing_index = pair
+            if opening_index == -1 or closing_index == -1:
+                continue
+            if best_pair is None or opening_index < best_pair[0]: # Picks the first delimiter pair in the text.
+                best_pair = (opening_index, closing_index, delim_type, delim_str)
+        if best_pair is None:
+            break
+        pairs_found = True
+        opening_index, closing_index, delim_type, delim_str = best_pair
+        if i < opening_index: # Only appends the node if there's actual text.
+            nodes.append(TextNode(text[i:opening_index], text_type))
+        split_delimited_text(text[opening_index + len(delim_str):closing_index], delim_type, nodes) # Processes nested delimiters.
+        i = closing_index + len(delim_str)
+    if not pairs_found:
+        nodes.append(TextNode(text, text_type))
+    elif i < len(text):
+        trailing_text = text[i:]
+        if nodes[-1].text != trailing_text: # Mirrors split_nodes_delimiter, which skips trailing text equal to the previous node.
+            nodes.append(TextNode(trailing_text, text_type))
 
-    def is_ordered_list_item(line):
-        parts = line.split(".", 1) # Splits by first period.
-        return len(parts) > 1 and parts[0].strip().isdigit() and parts[1].startswith(" ") # Checks if we have at least 2 parts and the first part is a number.
+def split_image_text(text, start, end, nodes): # Splits text[start:end] on images, then on delimiters.
+    for match in IMAGE_PATTERN.finditer(text, start, end):
+        if start < match.start():
+            split_delimited_text(text[start:match.start()], TextType.NORMAL, nodes)
+        nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        start = match.end()
+    if start < end:
+        split_delimited_text(text[start:end], TextType.NORMAL, nodes)
 
-    if stripped.startswith("```"): # Checks for an opening code block.
-        closing_index = stripped[3:].find("```") # Marks the end of the code block.
+def text_to_textnodes(text): # Single left-to-right pass with the same output as split_nodes_link, split_nodes_image and split_nodes_delimiter.
+    if not text: # The split_nodes_* chain passes an empty node through unchanged.
+        return [TextNode(text, TextType.NORMAL)]
+    nodes = []
+    pos = 0
+    for match in LINK_PATTERN.finditer(text):
+        link_index = text.find(match.group(0), pos) # Like split_nodes_link, splits on the first occurrence of the link text.
+        if pos < link_index:
+            split_image_text(text, pos, link_index, nodes)
+        nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        pos = link_index + len(match.group(0))
+    if pos < len(text):
+        split_image_text(text, pos, len(text), nodes)
+    if TRACE is not None:
+        TRACE.append(("inline", text, [(node.text_type.value, node.text) for node in nodes]))
+    return nodes
 
-        if closing_index != -1:  # Ensures there's a closing ```.
-            end_index = min(closing_index + 6, len(stripped))
-            code_block = stripped[:end_index] # Extracts the entire block including both the opening and closing ```.
-            split_blocks.append(code_block)
-            remaining_text = stripped[closing_index + 6:].strip()
+def is_ordered_list_item(line):
+    parts = line.split(".", 1) # Splits by first period.
+    return len(parts) > 1 and parts[0].strip().isdigit() and parts[1].startswith(" ") # Checks if we have at least 2 parts and the first part is a number.
 
-            if remaining_text.startswith("```") and remaining_text != "```":
-                raise ValueError(f"Unclosed code block detected in remaining markdown: {remaining_text}")
-            
-            elif not remaining_text or remaining_text == "```":
-                return split_blocks
-            
-            else:
-                split_blocks.extend(markdown_to_blocks(remaining_text)) # Recursively processes remaining content.
+def is_block_start(line): # Checks whether a stripped line opens a non-paragraph block.
+    return line.startswith("* ") or \
+        line.startswith("- ") or \
+        line.startswith(">") or \
+        line.startswith("#") or \
+        line.startswith("```") or \
+        is_ordered_list_item(line)
 
-        else:
-            raise ValueError(f"Unclosed code block detected in markdown starting with: {stripped[:30]}...")
+def scan_blocks(markdown): # Yields (form, start, end, level) spans in a single forward pass; `pos` never moves backwards. Nothing is sliced out of the source here.
+    end = len(markdown.rstrip())
+    pos = 0
+    trace = TRACE
 
-    elif stripped.startswith("#"):  # Checks for heading block.
-        sharp_count = len(stripped.split(" ")[0])  # Counts the leading `#` characters.
+    def line_end_at(pos): # Marks the end of the line starting at `pos`.
+        newline_index = markdown.find("\n", pos, end)
+        return end if newline_index == -1 else newline_index
 
-        if 1 <= sharp_count <= 6 and stripped[sharp_count] == " ": # Extracts heading content.
-            first_newline_index = stripped.find("\n")  # Finds where the heading ends.
+    while True:
+        while pos < end and markdown[pos].isspace(): # Skips the whitespace between blocks.
+            pos += 1
+        if pos >= end:
+            return
+        start = pos
 
-            if first_newline_index == -1:  # If no newline, the entire string is considered heading.
-                heading_content = stripped[sharp_count + 1:].strip()
-                split_blocks.append(f"{'#' * sharp_count} {heading_content}")
-                return split_blocks
-            
-            else:
-                heading_content = stripped[sharp_count + 1:first_newline_index].strip()
-                split_blocks.append(f"{'#' * sharp_count} {heading_content}") # Appends the isolated heading line.
-                remaining_text = stripped[first_newline_index + 1:].strip()
-                if remaining_text:
-                    split_blocks.extend(markdown_to_blocks(remaining_text))  # Recursively processes remaining content.
+        if markdown.startswith("```", pos, end): # Checks for an opening code block.
+            closing_index = markdown.find("```", pos + 3, end) # Marks the end of the code block.
+            if closing_index == -1:
+                raise MarkdownError(f"Unclosed code block detected in markdown starting with: {markdown[pos:min(pos + 30, end)]}...", pos)
+            if trace is not None: # The block runs through the closing ```.
+                trace.append(("split", "code", start, closing_index + 3))
+            yield BlockType.CODE, start, closing_index + 3, 0
+            pos = closing_index + 3
+            while pos < end and markdown[pos].isspace():
+                pos += 1
+            if pos >= end or (end - pos == 3 and markdown.startswith("```", pos, end)):
+                return
+            if markdown.startswith("```", pos, end):
+                raise MarkdownError(f"Unclosed code block detected in remaining markdown: {markdown[pos:end]}", pos)
 
-    elif stripped.startswith(">"): # Checks for an opening quote block.
-        line_count = 0 # Marks the end of the quote block.
-        lines = []
+        elif markdown.startswith("#", pos, end): # Checks for heading block.
+            space_index = markdown.find(" ", pos, min(pos + 7, end)) # Only 1-6 leading characters can form a heading marker.
+            if space_index == -1:
+                raise MarkdownError(f"Invalid heading: {markdown[pos:line_end_at(pos)][:30]}", pos)
+            line_end = line_end_at(pos) # Only the heading line belongs to the block.
+            if trace is not None:
+                trace.append(("split", "heading", start, line_end))
+            yield BlockType.HEADING, start, line_end, space_index - pos
+            pos = line_end + 1
 
-        for line in stripped.split("\n"):
-            if line.startswith(">"):
-                line_count += 1
-                lines.append(line.strip())
+        elif markdown.startswith(">", pos, end): # Checks for an opening quote block.
+            while pos < end and markdown.startswith(">", pos, end):
+                line_end = line_end_at(pos)
+                pos = line_end + 1
+            if trace is not None:
+                trace.append(("split", "quote", start, line_end))
+            yield BlockType.QUOTE, start, line_end, 0
 
-            else:
-                break
+        elif markdown.startswith("* ", pos, end) or markdown.startswith("- ", pos, end) or markdown.startswith("1. ", pos, end): # Checks for lists.
+            ordered = markdown.startswith("1. ", pos, end)
+            item_marker = markdown[pos:pos + 2]
+            newline_count = 0
+            block_end = pos
+            while pos < end:
+                line_end = line_end_at(pos)
+                if line_end == pos: # Breaks after 2 consecutive empty lines.
+                    newline_count += 1
+                    if newline_count >= 2:
+                        break
+                elif (ordered and is_ordered_list_item(markdown[pos:line_end])) or (not ordered and markdown.startswith(item_marker, pos, line_end)): # Adds valid list items.
+                    newline_count = 0
+                    block_end = line_end # Trailing empty lines stay outside the block.
+                else:
+                    break # Stops processing for this block type to avoid mixing blocks.
+                pos = line_end + 1
+            if trace is not None:
+                trace.append(("split", "ordered_list" if ordered else "unordered_list", start, block_end))
+            yield BlockType.ORDERED_LIST if ordered else BlockType.UNORDERED_LIST, start, block_end, 0
 
-        split_blocks.append("\n".join(lines)) # Appends the quote block.
-        split_blocks.extend(markdown_to_blocks("\n".join(stripped.split("\n")[line_count:]))) # Recursively processes the remaining text.
-
-    elif stripped.startswith("* ") or stripped.startswith("- "): # Checks for unordered lists. 
-        marker = stripped[0]
-        lines = []
-        newline_count = 0
-        original_lines = stripped.split("\n")
-        i = 0
-        
-        while i < len(original_lines):
-            line = original_lines[i]
-            if line == "": # Breaks after 2 consecutive empty lines.
-                newline_count += 1
-                if newline_count >= 2:
-                    break
-                if len(lines) > 0:  # Only allows blank lines if a list block exists.
-                    lines.append("")
-            elif line.startswith(f"{marker} "): # Adds valid list items.
-                newline_count = 0
-                lines.append(line)
-            else:
-                break  # Stops processing for this block type to avoid mixing blocks.
-            i += 1
-        
-        block = "\n".join(lines).strip()
-        if block:
-            split_blocks.append(block) # Appends the list block.
-        
-        if i < len(original_lines): # Processes remaining lines.
-            remaining_text = "\n".join(original_lines[i:])
-            recursive_blocks = markdown_to_blocks(remaining_text)
-            split_blocks.extend(recursive_blocks)
-
-    elif stripped[:3] == "1. ": # Checks for ordered lists.
-        lines = []
-        newline_count = 0
-        original_lines = stripped.split("\n")
-        i = 0
-        
-        while i < len(original_lines):
-            line = original_lines[i]
-            if line == "": # Breaks after 2 consecutive empty lines.
-                newline_count += 1
-                if newline_count >= 2:
+        else: # Collects lines into a paragraph until a block marker is found.
+            block_end = pos
+            while pos < end:
+                line_end = line_end_at(pos)
+                line = markdown[pos:line_end].strip()
+                if is_block_start(line):
+                    if block_end == start: # A marker that no block branch accepts, e.g. "2. " without a "1. ".
+                        if trace is not None:
+                            trace.append(("stall", line, pos, line_end))
+                        raise MarkdownError(f"Unable to process remaining markdown, stalled at '{markdown[pos:min(pos + 30, end)]}...'", pos) # Reported with the page's other errors, never printed from here.
                     break
-                lines.append("")
+                if line:
+                    block_end = line_end
+                pos = line_end + 1
+            if trace is not None:
+                trace.append(("split", "paragraph", start, block_end))
+            yield BlockType.PARAGRAPH, start, block_end, 0
 
-            elif is_ordered_list_item(line): # Adds valid list items.
-                newline_count = 0
-                lines.append(line)
+def iter_markdown_blocks(markdown):
+    for form, start, end, level in scan_blocks(markdown):
+        yield BlockNode.from_span(markdown, form, start, end, level).text
 
-            else:
-                    break  # Stops processing for this block type to avoid mixing blocks.
-            i += 1
-        
-        block = "\n".join(lines).strip()
-        if block:  # Only appends non-empty blocks.
-            split_blocks.append(block)
-        
-        remaining_lines = original_lines[i:]
-        if remaining_lines:
-            remaining_text = "\n".join(remaining_lines).strip()
-            if remaining_text and remaining_text != stripped:  # Only recurse if we have new text.
-                split_blocks.extend(markdown_to_blocks(remaining_text))
-            
+def scan_mapped_blocks(source, window=STREAM_WINDOW): # Same blocks as scan_blocks(source.decode()), but only ever decodes one window of a UTF-8 buffer such as an mmap. Yields (window text, its offset, form, start, end, level).
+    size = len(source)
+    byte_pos = 0
+    char_base = 0 # Offsets stay character offsets into the whole document.
+    while byte_pos < size:
+        window_end = source.find(b"\n", byte_pos + window) # Cutting at a newline never splits a character or a line.
+        if window_end == -1:
+            try:
+                text = source[byte_pos:].decode()
+                for form, start, end, level in scan_blocks(text): # The rest of the document, scanned exactly like the in-memory path.
+                    yield text, char_base, form, start, end, level
+            except MarkdownError as e:
+                e.offset += char_base
+                raise
+            return
+        text = source[byte_pos:window_end].decode()
+        blocks = []
+        try:
+            for scanned in scan_blocks(text):
+                blocks.append(scanned)
+        except ValueError: # Possibly only because the window cut a block short; retried with more text.
+            pass
+        if len(blocks) < 3:
+            window *= 2
+            continue
+        # The last block may have been cut off, and the one before it may have been ended by the window's final,
+        # right-stripped line, so both are scanned again as the start of the next window.
+        for form, start, end, level in blocks[:-2]:
+            yield text, char_base, form, start, end, level
+        resume = blocks[-2][1]
+        byte_pos += len(text[:resume].encode())
+        char_base += resume
+
+def parse_blocks(markdown): # Builds typed block records over spans of the source, classifying each block exactly once. Also accepts a mapped UTF-8 buffer.
+    if isinstance(markdown, str):
+        for form, start, end, level in scan_blocks(markdown):
+            yield span_to_block(markdown, 0, form, start, end, level)
     else:
-        lines = stripped.split("\n")  # Splits markdown into individual lines.
-        paragraph_lines = []
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-
-            if line.startswith("* ") or \
-                line.startswith("- ") or \
-                line.startswith(">") or \
-                line.startswith("#") or \
-                line.startswith("```") or \
-                is_ordered_list_item(line): # Breaks and processes when encountering a block marker.
-                if paragraph_lines: # Appends collected paragraph lines first as a single block.
-                    split_blocks.append("\n".join(paragraph_lines))  # Joins lines with newlines to preserve formatting.
-                    paragraph_lines = []  # Resets for the next block.
-
-                remaining_text = "\n".join(lines[i:]).strip()
-                if remaining_text == markdown:
-                    print(f"Unexpected stalling input: '{remaining_text[:30]}...'")
-                    raise ValueError("Unable to process remaining markdown.")
-                if remaining_text: # Recurse for remaining lines from the current marker onward.
-                    remaining_blocks = markdown_to_blocks(remaining_text)
-                    if remaining_blocks:  # Ensures `remaining_blocks` is not None.
-                        split_blocks.extend(remaining_blocks)
-                    break  # Stops further looping as recursion will handle the rest.
-
-            else: # Collects non-marker lines as part of the current paragraph.
-                if line:
-                    paragraph_lines.append(line)
+        for text, base, form, start, end, level in scan_mapped_blocks(markdown):
+            yield span_to_block(text, base, form, start, end, level)
 
-        if paragraph_lines: # Appends trailing paragraph lines if no markers were found.
-            split_blocks.append("\n".join(paragraph_lines))
+def span_to_block(source, base, form, start, end, level): # The scanner's branch already settles the type, except that a list can still turn out to be a paragraph.
+    block = BlockNode.from_span(source, form, start, end, level, base=base)
+    if form is BlockType.ORDERED_LIST or form is BlockType.UNORDERED_LIST: # Misnumbered items, or a lone marker with nothing after it.
+        block.block_type = classify_block(block.text, block.lines)
+    if TRACE is not None:
+        TRACE.append(("classify", block.block_type.value, block.start, block.end))
+    return block
 
-    if not isinstance(split_blocks, list):
-        raise AssertionError(f"split_blocks is {type(split_blocks)}, expected list")
-    if len(split_blocks) == 0:
-        raise AssertionError("split_blocks is empty unexpectedly!")
-    return split_blocks
+@contextmanager
+def traced(events=None): # Records parser events into `events` (a new list by default) for the duration of the block.
+    global TRACE
+    previous = TRACE
+    TRACE = [] if events is None else events
+    try:
+        yield TRACE
+    finally:
+        TRACE = previous
 
-def block_to_block_type(markdown_block):
+@contextmanager
+def precompressing(precompressor): # Hands every page written inside the block to `precompressor` for its sidecars.
+    global PRECOMPRESS
+    previous = PRECOMPRESS
+    PRECOMPRESS = precompressor
+    try:
+        yield precompressor
+    finally:
+        PRECOMPRESS = previous
+
+def describe_error(e): # One format for page errors in every build mode, e.g. "MarkdownError: Invalid code block (line 3)".
+    return f"{type(e).__name__}: {e}"
+
+def format_trace_event(event):
+    kind = event[0]
+    if kind == "inline": # ("inline", text, [(text_type, text), ...])
+        return f"inline    {event[1]!r} -> " + ", ".join(f"{text_type} {text!r}" for text_type, text in event[2])
+    if kind == "error": # ("error", message)
+        return f"error     {event[1]}"
+    return f"{kind:<9} {event[1]} [{event[2]}:{event[3]}]" # ("split" | "classify" | "stall", detail, start, end)
+
+def trace_page(source_path, basepath): # Renders one page through the normal code path and prints every parser decision.
+    template = open_template("template.html", basepath)
+    with traced() as events:
+        try:
+            render_page_file(source_path, template)
+        except Exception as e:
+            events.append(("error", describe_error(e)))
+    for event in events:
+        print(format_trace_event(event))
+
+def markdown_to_blocks(markdown):
+    return list(iter_markdown_blocks(markdown))
+
+def classify_block(markdown_block, lines): # `lines` is markdown_block split on newlines.
     if markdown_block[:3] == "```" and markdown_block[-3:] == "```": # Code blocks: Checks for triple backticks at start and end.
-        return "code"
+        return BlockType.CODE
     elif markdown_block[0] == '#': # Headings: Checks for 1-6 #'s followed by space.
         count = 0
         for char in markdown_block[:6]:
@@ -312,182 +442,211 @@ def block_to_block_type(markdown_block):
             else:
                 break
         if 0 < count <= 6 and markdown_block[count] == ' ':
-            return "heading"
+            return BlockType.HEADING
         else:
-            return "paragraph"
+            return BlockType.PARAGRAPH
     elif markdown_block[0] == ">": # Quotes: All non-empty lines must start with ">".
         passed = True
-        for line in markdown_block.split("\n"):
+        for line in lines:
             if line == "":
                 continue
             if line[0] != ">":
                 passed = False
         if passed:
-            return "quote"
+            return BlockType.QUOTE
         else:
-            return "paragraph"
+            return BlockType.PARAGRAPH
     elif markdown_block[:2] == "* " or markdown_block[:2] == "- ": # Unordered lists: All non-empty lines must start with either "* " or "- ".
         marker = markdown_block[0]
         passed = True
-        for line in markdown_block.split("\n"):
+        for line in lines:
             if line == "":
                 continue
             if line[:2] != f"{marker} ":
                 passed = False
         if passed:
-            return "unordered_list"
+            return BlockType.UNORDERED_LIST
         else:
-            return "paragraph"
+            return BlockType.PARAGRAPH
     elif markdown_block[:3] == "1. ": # Ordered lists: Must start with "1. " and each subsequent non-empty line must increment.
         passed = True
         count = 1
-        for line in markdown_block.split("\n"):
+        for line in lines:
             if line == "":
                 continue
             if line[:len(str(count)) + 2] != f"{count}. ":
                 passed = False
             count += 1
         if passed:
-            return "ordered_list"
+            return BlockType.ORDERED_LIST
         else:
-            return "paragraph"
+            return BlockType.PARAGRAPH
     else: # Paragraphs: Anything that doesn’t match the above.
-        return "paragraph"
-
-def markdown_to_html_node(markdown):
-
-    def process_list_items(block, ordered=False):
-        lines = block.split('\n')
-        items = []
-        current_item = []
-        
-        for line in lines: # Checks for both unordered and ordered list markers.
-            is_new_item = False
-            if not ordered and (line.startswith('* ') or line.startswith('- ')):
-                is_new_item = True
-                line = line[2:]  # Removes '* ' or '- '.
-            elif ordered and re.match(r'^\d+\.\s', line):
-                is_new_item = True
-                line = re.sub(r'^\d+\.\s+', '', line)  # Removes the "1. " part.
-                
-            if is_new_item:
-                if current_item:
-                    items.append('\n'.join(current_item))
-                current_item = [line]
-            elif line.strip() == '': # Empty line
-                if current_item:
-                    current_item.append(line)
-            elif line.startswith('  '): # Indented continuation line
-                if current_item:
-                    current_item.append(line.strip())
-            else: # Any other line
-                if current_item:
-                    current_item.append(line.strip())
-        
-        if current_item: # Appends the last item.
-            items.append('\n'.join(current_item))
-        return items
-
-    blocks = markdown_to_blocks(markdown)
+        return BlockType.PARAGRAPH
+
+def block_to_block_type(markdown_block):
+    return classify_block(markdown_block, markdown_block.split("\n")).value
+
+def markdown_to_html_node(markdown, basepath=None, assets=None):
+    try:
+        return blocks_to_html_node(parse_blocks(markdown), basepath, assets=assets)
+    except MarkdownError as e:
+        e.locate(markdown)
+        raise
+
+def process_list_items(lines, ordered=False):
+    items = []
+    current_item = []
+    
+    for line in lines: # Checks for both unordered and ordered list markers.
+        is_new_item = False
+        if not ordered and (line.startswith('* ') or line.startswith('- ')):
+            is_new_item = True
+            line = line[2:]  # Removes '* ' or '- '.
+        elif ordered and re.match(r'^\d+\.\s', line):
+            is_new_item = True
+            line = re.sub(r'^\d+\.\s+', '', line)  # Removes the "1. " part.
+            
+        if is_new_item:
+            if current_item:
+                items.append('\n'.join(current_item))
+            current_item = [line]
+        elif line.strip() == '': # Empty line
+            if current_item:
+                current_item.append(line)
+        elif line.startswith('  '): # Indented continuation line
+            if current_item:
+                current_item.append(line.strip())
+        else: # Any other line
+            if current_item:
+                current_item.append(line.strip())
+    
+    if current_item: # Appends the last item.
+        items.append('\n'.join(current_item))
+    return items
+
+def blocks_to_html_node(blocks, basepath=None, memo=None, assets=None): # Builds the page's node tree from parsed BlockNodes, running the inline parser on each.
     div = ParentNode("div", None) # Creates the main container node.
     nodes = []
-
     for block in blocks:
-        if block_to_block_type(block) == "code": # Wraps blocks in nested nodes and removes the first and last lines.
-            outer_node = ParentNode('pre', None)
-            lines = block.split("\n")
-            if len(lines) < 3:  # Needs at least opening, content, and closing lines.
-                raise ValueError("Invalid code block")
-            if lines and lines[0].strip().startswith("```"): # Removes the opening line with backticks (regardless of language identifier).
-                lines = lines[1:]
-            if lines and lines[-1].strip() == "```": # Removes the closing line with backticks.
-                lines = lines[:-1]
-            inner_node = ParentNode("code", None)
-            inner_node.children = [LeafNode(None, "\n".join(lines))]
-            outer_node.children = [inner_node]
-            nodes.append(outer_node)
-
-        elif block_to_block_type(block) == "heading": # Wraps heading blocks in the right node type and processes the text further.
-            count = len(block) - len(block.lstrip('#'))
-            lines = block.split("\n", maxsplit = 1)
-            outer_node = ParentNode(f'h{count}', None)
-            text_node = text_to_textnodes(lines[0].lstrip('#').strip())
-            inner_node = [text_node_to_html_node(node) for node in text_node]
-            outer_node.children = inner_node
-            nodes.append(outer_node)
-            if len(lines) > 1: # Appends the remaining text as a paragraph.
-                paragraph_outer_node = ParentNode(f'p', None)
-                text_nodes = text_to_textnodes(lines[1])
-                paragraph_inner_nodes = [text_node_to_html_node(node) for node in text_nodes]
-                paragraph_outer_node.children = paragraph_inner_nodes
-                nodes.append(paragraph_outer_node)
-
-        elif block_to_block_type(block) == "quote": # Wraps quote blocks in a parent node, strips '>' from the beginning of lines and processes the text further.
-            outer_node = ParentNode('blockquote', None)
-            lines = block.split("\n")
-            stripped_lines = [line.lstrip('>').strip() for line in lines]
-            text = " ".join(stripped_lines)
-            text = re.sub(r'\s+', ' ', text)
-            text_node = LeafNode(None, text)
-            outer_node.children = [text_node]
-            nodes.append(outer_node)
-
-        elif block_to_block_type(block) == "unordered_list": # Wraps unordered lists in a parent node, strips '* ' or '- ' from the beginning of lines and wraps them in 'li' nodes before processing them furter.
-            outer_node = ParentNode('ul', None)
-            items = process_list_items(block, ordered=False)
-            li_nodes = []
-            for item in items:
-                li_node = ParentNode('li', None)
-                text_nodes = text_to_textnodes(item)
-                inner_nodes = [text_node_to_html_node(node) for node in text_nodes]
-                li_node.children = inner_nodes
-                li_nodes.append(li_node)
-            outer_node.children = li_nodes
-            nodes.append(outer_node)
-
-        elif block_to_block_type(block) == "ordered_list": # Wraps ordered lists in a parent node, strips numbers and periods from the beginning of lines and wraps them in 'li' nodes before processing them furter.
-            outer_node = ParentNode('ol', None)
-            items = process_list_items(block, ordered=True)
-            li_nodes = []
-            for item in items:
-                li_node = ParentNode('li', None)
-                text_nodes = text_to_textnodes(item)
-                inner_nodes = [text_node_to_html_node(node) for node in text_nodes]
-                li_node.children = inner_nodes
-                li_nodes.append(li_node)
-            outer_node.children = li_nodes
-            nodes.append(outer_node)
-
-        elif block_to_block_type(block) == "paragraph": # Wraps paragraph blocks in a parent node type and processes the text further.
-            outer_node = ParentNode(f'p', None)
-            text_nodes = text_to_textnodes(block)
-            inner_nodes = [text_node_to_html_node(node) for node in text_nodes]
-            outer_node.children = inner_nodes
-            nodes.append(outer_node)
-
+        if memo is None:
+            block_to_html_nodes(block, basepath, nodes, assets)
         else:
-            raise ValueError("Invalid markdown format")
-
+            memoized_block_to_html_nodes(block, basepath, nodes, memo, assets)
     div.children = nodes
     return div
 
+def memoized_block_to_html_nodes(block, basepath, nodes, memo, assets=None): # Reuses the HTML of an identical block rendered earlier in the build.
+    size = block.end - block.start
+    if not memo.fits(size): # Too big to keep, so not worth slicing out and hashing for a key either.
+        block_to_html_nodes(block, basepath, nodes, assets)
+        return
+    key = (basepath, assets.digest if assets is not None else None, block.block_type, block.form, block.raw) # Everything a block renders from is derived from its source and how it was scanned.
+    html = memo.get(key)
+    if html is None:
+        block_nodes = []
+        block_to_html_nodes(block, basepath, block_nodes, assets)
+        html = "".join(node.to_html() for node in block_nodes)
+        memo.put(key, html, size + len(html)) # The key holds the block's source alive too.
+    nodes.append(LeafNode(None, html))
+
+def block_to_html_nodes(block, basepath, nodes, assets=None): # Appends the nodes for one block to `nodes`.
+    block_type = block.block_type
+    if block_type is BlockType.CODE: # Wraps blocks in nested nodes and removes the first and last lines.
+        outer_node = ParentNode('pre', None)
+        source, start, end = block.span()
+        first_newline = source.find("\n", start, end)
+        last_newline = source.rfind("\n", start, end)
+        if first_newline == last_newline:  # Needs at least opening, content, and closing lines.
+            raise MarkdownError("Invalid code block", block.start)
+        content_start, content_end = start, end # The code is cut out of the source in one slice instead of splitting and re-joining its lines.
+        if source[start:first_newline].strip().startswith("```"): # Removes the opening line with backticks (regardless of language identifier).
+            content_start = first_newline + 1
+        if source[last_newline + 1:end].strip() == "```": # Removes the closing line with backticks.
+            content_end = last_newline
+        inner_node = ParentNode("code", None)
+        inner_node.children = [LeafNode(None, source[content_start:content_end])]
+        outer_node.children = [inner_node]
+        nodes.append(outer_node)
+
+    elif block_type is BlockType.HEADING: # Wraps heading blocks in the right node type and processes the text further.
+        source, start, end = block.span()
+        newline_index = source.find("\n", start, end)
+        outer_node = ParentNode(f'h{block.level}', None)
+        text_node = text_to_textnodes(source[start + block.level:end if newline_index == -1 else newline_index].strip()) # Sliced from after the marker, which the scanner measured up to the first space, as BlockNode.text is.
+        inner_node = [text_node_to_html_node(node, basepath, assets) for node in text_node]
+        outer_node.children = inner_node
+        nodes.append(outer_node)
+        if newline_index != -1: # Appends the remaining text as a paragraph.
+            paragraph_outer_node = ParentNode(f'p', None)
+            text_nodes = text_to_textnodes(source[newline_index + 1:end])
+            paragraph_inner_nodes = [text_node_to_html_node(node, basepath, assets) for node in text_nodes]
+            paragraph_outer_node.children = paragraph_inner_nodes
+            nodes.append(paragraph_outer_node)
+
+    elif block_type is BlockType.QUOTE: # Wraps quote blocks in a parent node, strips '>' from the beginning of lines and processes the text further.
+        outer_node = ParentNode('blockquote', None)
+        stripped_lines = [line.lstrip('>').strip() for line in block.lines]
+        text = " ".join(stripped_lines)
+        text = re.sub(r'\s+', ' ', text)
+        text_node = LeafNode(None, text)
+        outer_node.children = [text_node]
+        nodes.append(outer_node)
+
+    elif block_type is BlockType.UNORDERED_LIST: # Wraps unordered lists in a parent node, strips '* ' or '- ' from the beginning of lines and wraps them in 'li' nodes before processing them furter.
+        outer_node = ParentNode('ul', None)
+        items = process_list_items(block.lines, ordered=False)
+        li_nodes = []
+        for item in items:
+            li_node = ParentNode('li', None)
+            text_nodes = text_to_textnodes(item)
+            inner_nodes = [text_node_to_html_node(node, basepath, assets) for node in text_nodes]
+            li_node.children = inner_nodes
+            li_nodes.append(li_node)
+        outer_node.children = li_nodes
+        nodes.append(outer_node)
+
+    elif block_type is BlockType.ORDERED_LIST: # Wraps ordered lists in a parent node, strips numbers and periods from the beginning of lines and wraps them in 'li' nodes before processing them furter.
+        outer_node = ParentNode('ol', None)
+        items = process_list_items(block.lines, ordered=True)
+        li_nodes = []
+        for item in items:
+            li_node = ParentNode('li', None)
+            text_nodes = text_to_textnodes(item)
+            inner_nodes = [text_node_to_html_node(node, basepath, assets) for node in text_nodes]
+            li_node.children = inner_nodes
+            li_nodes.append(li_node)
+        outer_node.children = li_nodes
+        nodes.append(outer_node)
+
+    elif block_type is BlockType.PARAGRAPH: # Wraps paragraph blocks in a parent node type and processes the text further.
+        outer_node = ParentNode(f'p', None)
+        text_nodes = text_to_textnodes(block.text)
+        inner_nodes = [text_node_to_html_node(node, basepath, assets) for node in text_nodes]
+        outer_node.children = inner_nodes
+        nodes.append(outer_node)
+
+    else:
+        raise MarkdownError("Invalid markdown format", block.start)
+
 def copy_dir_contents(source_path, dest_path):
     source_path = os.path.normpath(source_path)
     dest_path = os.path.normpath(dest_path)
     if os.path.exists(dest_path):
         shutil.rmtree(dest_path)
         os.mkdir(dest_path)
-        print("Destination folder cleaned and recreated")
+        log.detail("Destination folder cleaned and recreated")
     else:
         os.mkdir(dest_path)
-        print("Destination folder created")
+        log.detail("Destination folder created")
 
     if not os.path.exists(source_path):
         raise Exception(f"Invalid source path: {source_path}")
     
     contents = os.listdir(path=source_path)
     if not contents:
-        print(f"No files or subdirectories to copy: {source_path}")
+        if log.verbose:
+            log.detail(f"No files or subdirectories to copy: {source_path}")
     else:
         for item in contents:
             source_item = os.path.join(source_path, item)
@@ -495,16 +654,21 @@ def copy_dir_contents(source_path, dest_path):
             if os.path.isfile(source_item):
                 try:
                     shutil.copy(source_item, dest_item)
-                    print(f"File copied: {source_item}")
+                    if log.verbose:
+                        log.detail(f"File copied: {source_item}")
                 except Exception as e:
-                    print(f"Error copying file {source_item}: {e}")
+                    log.error(f"Error copying file {source_item}: {e}")
             else:
                 try:
                     os.mkdir(dest_item)
-                    print(f"Directory created: {dest_item}")
+                    if log.verbose:
+                        log.detail(f"Directory created: {dest_item}")
                     copy_dir_contents(source_item, dest_item)
                 except Exception as e:
-                    print(f"Error creating directory {dest_item}: {e}")
+                    log.error(f"Error creating directory {dest_item}: {e}")
+
+def open_template(template_path, basepath):
+    return PageTemplate.from_file(template_path, basepath, MINIFY, ASSETS)
 
 def extract_title(markdown):
     stripped = markdown.strip()
@@ -516,60 +680,646 @@ def extract_title(markdown):
             return line[2:].strip()
     raise ValueError("No h1 header found")
 
-def generate_page(source_path, template_path, dest_path, basepath):
-    print(f"Generating page from {source_path} to {dest_path} using {template_path}")
-    with open(source_path) as f:
-        markdown = f.read()
-    with open(template_path) as f:
-        template = f.read()
-    html_str = markdown_to_html_node(markdown).to_html()
-    title = extract_title(markdown)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html_str)
-    template = template.replace('href="/', f'href="{basepath}')
-    template = template.replace('src="/', f'src="{basepath}')
+def extract_mapped_title(source): # extract_title for a mapped UTF-8 buffer, reading only up to the title line.
+    size = len(source)
+    pos = 0
+    seen_text = False
+    while pos < size:
+        line_end = source.find(b"\n", pos)
+        if line_end == -1:
+            line_end = size
+        line = source[pos:line_end]
+        if not seen_text: # extract_title strips the document, so only the first non-blank line loses its indentation.
+            seen_text = bool(line.strip())
+            line = line.lstrip()
+        if line.startswith(b"# "):
+            return line[2:].decode().strip()
+        pos = line_end + 1
+    if not seen_text:
+        raise ValueError("Empty input string")
+    raise ValueError("No h1 header found")
+
+def render_content(markdown, template, timer, page=None, cache=None, memo=None): # Returns the title and the content node, timing each stage. With a cache, the node holds the content's HTML.
+    if cache is not None:
+        with timer.span("cache", page):
+            cache_key = cache.key(markdown, template.basepath, template.assets)
+            html = cache.get(cache_key)
+        if html is not None:
+            timer.count("cache_hits")
+            return extract_title(markdown), LeafNode(None, html)
+        timer.count("cache_misses")
+    if memo is not None:
+        hits, misses = memo.hits, memo.misses
+    try:
+        with timer.span("blocks", page):
+            blocks = list(parse_blocks(markdown))
+        with timer.span("inline", page):
+            content_node = blocks_to_html_node(blocks, template.basepath, memo, template.assets) # Links are rewritten as nodes are built, so the page is never rescanned.
+    except MarkdownError as e:
+        e.locate(markdown)
+        raise
+    title = extract_title(markdown) # Left untimed, as on a cache hit; it's after the inline parser so parse errors are reported first.
+    if memo is not None:
+        timer.count("block_hits", memo.hits - hits)
+        timer.count("block_misses", memo.misses - misses)
+    if cache is not None: # The cache needs the HTML as a string; without one the node is serialized as it's written.
+        with timer.span("render", page):
+            html = content_node.to_html()
+        with timer.span("cache", page):
+            cache.put(cache_key, html)
+        content_node = LeafNode(None, html)
+    return title, content_node
+
+def render_chunks(content_node, timer, page=None): # Serializes the content for template.fill(), where the whole page has to be in memory anyway.
+    with timer.span("render", page):
+        chunks = []
+        content_node.write_html(chunks)
+    return chunks
+
+def render_page(markdown, template, timer=None, page=None, cache=None, memo=None):
+    if timer is None:
+        timer = BuildTimer()
+    title, content_node = render_content(markdown, template, timer, page, cache, memo)
+    chunks = render_chunks(content_node, timer, page)
+    with timer.span("template", page):
+        return "".join(template.fill(title, chunks))
+
+def render_page_file(source_path, template, timer=None, cache=None, memo=None):
+    if timer is None:
+        timer = BuildTimer()
+    with timer.span("read", source_path):
+        with open(source_path) as f:
+            markdown = f.read()
+    return render_page(markdown, template, timer, source_path, cache, memo)
+
+@contextmanager
+def open_page(dest_path, keep=True): # Writes to a temporary file that replaces the page only once it's complete, and only if its bytes changed.
     dest_dir = os.path.dirname(dest_path)
     os.makedirs(dest_dir, exist_ok=True)
-    print("Destination directory created: ", dest_dir)
-    with open(dest_path, 'w') as f:
-        f.write(template)
+    tmp_path = f"{dest_path}.tmp"
+    precompressor = PRECOMPRESS
+    try:
+        with open(tmp_path, 'wb') as f:
+            out = PageWriter(f, keep=keep and precompressor is not None) # Keeps the bytes so the sidecars don't have to read the page back.
+            yield out
+            out.flush()
+        start = time.perf_counter()
+        if out.matches(dest_path): # Leaves the existing file and its mtime alone, so syncs and caches see no change.
+            out.unchanged = True
+        else:
+            os.replace(tmp_path, dest_path)
+        out.seconds += time.perf_counter() - start
+        if precompressor is not None:
+            precompressor.add(dest_path, out.data(), out.unchanged)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_page(dest_path, html): # Returns True if the page was already up to date on disk.
+    with open_page(dest_path) as f:
+        f.write(html)
+    return f.unchanged
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
+def is_large_page(source_path):
+    size = os.path.getsize(source_path)
+    return size > 0 and size >= STREAM_THRESHOLD # An empty file can't be mapped, and has nothing to stream anyway.
+
+def mapped_line_number(source, offset): # Line number of a character offset in a mapped UTF-8 buffer, decoded a window at a time.
+    line = 1
+    pos = 0
+    while True:
+        window_end = source.find(b"\n", pos + STREAM_WINDOW)
+        text = source[pos:len(source) if window_end == -1 else window_end].decode()
+        if offset <= len(text) or window_end == -1:
+            return line + text.count("\n", 0, offset)
+        offset -= len(text)
+        line += text.count("\n")
+        pos = window_end
+
+def generate_streamed_page(source_path, dest_path, template, timer, memo=None): # Parses, renders and writes one block at a time, so memory is bounded by the largest block.
+    with open(source_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source, timer.span("stream", source_path):
+        try:
+            if write_streamed_page(source, dest_path, template, memo):
+                timer.count("writes_skipped")
+        except MarkdownError as e:
+            if e.line is None and e.offset is not None:
+                e.line = mapped_line_number(source, e.offset)
+            raise
+
+def write_streamed_page(source, dest_path, template, memo):
+    try:
+        title = extract_mapped_title(source)
+    except ValueError:
+        for _ in parse_blocks(source): # The in-memory path reports parse errors before a missing title.
+            pass
+        raise
+    with open_page(dest_path, keep=False) as page: # Sidecars of a streamed page are compressed from the file instead.
+        out = HtmlMinifier(page.write) if template.minify else page
+        out.write(template.segments[0])
+        for slot, segment in zip(template.slots, template.segments[1:]):
+            if slot == "Content":
+                out.write("<div>")
+                for block in parse_blocks(source):
+                    nodes = []
+                    if memo is None:
+                        block_to_html_nodes(block, template.basepath, nodes, template.assets)
+                    else:
+                        memoized_block_to_html_nodes(block, template.basepath, nodes, memo, template.assets)
+                    for node in nodes:
+                        node.write_html(out)
+                out.write("</div>")
+            else:
+                out.write(title)
+            out.write(segment)
+        if template.minify:
+            out.close()
+    return page.unchanged
+
+def split_large_pages(pages): # Separates out the pages that have to be streamed.
+    small_pages, large_pages = [], []
+    for page in pages:
+        (large_pages if is_large_page(page[0]) else small_pages).append(page)
+    return small_pages, large_pages
+
+def generate_streamed_pages(pages, template, timer, manifest, errors, memo=None): # Streams large pages in this process instead of handing them to a worker or reader whole.
+    for source_path, dest_path in pages:
+        try:
+            generate_streamed_page(source_path, dest_path, template, timer, memo)
+        except Exception as e:
+            errors.append((source_path, describe_error(e)))
+            continue
+        if manifest is not None:
+            manifest.mark_built(source_path)
+
+def generate_page(source_path, template_path, dest_path, basepath, template=None, timer=None, cache=None, memo=None):
+    if log.verbose:
+        log.detail(f"Generating page from {source_path} to {dest_path} using {template_path}")
+    if template is None:
+        template = open_template(template_path, basepath)
+    if timer is None:
+        timer = BuildTimer()
+    if is_large_page(source_path):
+        generate_streamed_page(source_path, dest_path, template, timer, memo)
+        return
+    with timer.span("read", source_path):
+        with open(source_path) as f:
+            markdown = f.read()
+    title, content_node = render_content(markdown, template, timer, source_path, cache, memo)
+    with open_page(dest_path) as f: # Serializes the content and fills the template straight into the file, so the page is never held whole.
+        render_seconds, template_seconds = template.write(f, title, content_node)
+    timer.add("render", render_seconds, source_path) # Interleaved with the writes, so timed by the template rather than with spans.
+    timer.add("template", template_seconds, source_path)
+    timer.add("write", f.seconds, source_path) # Encoding, hashing and writing, as timed by the writer.
+    if f.unchanged:
+        timer.count("writes_skipped")
+    if log.verbose:
+        log.detail(f"Destination directory created: {os.path.dirname(dest_path)}")
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, manifest=None, template=None, timer=None, cache=None, memo=None):
     dir_path_content = os.path.normpath(dir_path_content)
     template_path = os.path.normpath(template_path)
     dest_dir_path = os.path.normpath(dest_dir_path)
+    if template is None: # Compiled once at the top of the walk and shared with every page.
+        template = open_template(template_path, basepath)
+    if timer is None:
+        timer = BuildTimer()
     
     if not os.path.exists(dir_path_content):
         raise Exception(f"Invalid content path: {dir_path_content}")
     
-    contents = os.listdir(path=dir_path_content)
+    with timer.span("discovery"):
+        contents = os.listdir(path=dir_path_content)
     if not contents:
-        print(f"No files or subdirectories in content directory: {dir_path_content}")
+        if log.verbose:
+            log.detail(f"No files or subdirectories in content directory: {dir_path_content}")
     else:
         for item in contents:
             content_item = os.path.join(dir_path_content, item)
             dest_item = os.path.join(dest_dir_path, item)
             if os.path.isfile(content_item) and content_item[-3:] == ".md":
+                dest_page = os.path.join(dest_dir_path, "index.html")
                 try:
-                    generate_page(content_item, template_path, os.path.join(dest_dir_path, "index.html"), basepath)
+                    if manifest is not None:
+                        with timer.span("check"):
+                            needs_build = manifest.needs_build(content_item, dest_page)
+                        if not needs_build: # Skips pages whose inputs haven't changed.
+                            continue
+                    generate_page(content_item, template_path, dest_page, basepath, template, timer, cache, memo)
+                    if manifest is not None:
+                        manifest.mark_built(content_item)
                 except Exception as e:
-                    print(f"Could not generate page from {content_item}: {e}")
+                    log.error(f"Could not generate page from {content_item}: {describe_error(e)}")
             elif os.path.isdir(content_item):
                 try:
                     os.makedirs(dest_item, exist_ok=True)
-                    print(f"Directory ensured: {dest_item}")
-                    generate_pages_recursive(content_item, template_path, dest_item, basepath)
+                    if log.verbose:
+                        log.detail(f"Directory ensured: {dest_item}")
+                    generate_pages_recursive(content_item, template_path, dest_item, basepath, manifest, template, timer, cache, memo)
                 except Exception as e:
-                    print(f"Error creating directory {dest_item}: {e}")
-    
+                    log.error(f"Error creating directory {dest_item}: {e}")
+
+def find_pages(dir_path_content, dest_dir_path): # Lists (source, destination) pairs in a stable order.
+    dir_path_content = os.path.normpath(dir_path_content)
+    dest_dir_path = os.path.normpath(dest_dir_path)
+    if not os.path.exists(dir_path_content):
+        raise Exception(f"Invalid content path: {dir_path_content}")
+
+    pages = []
+    for root, dirs, files in os.walk(dir_path_content):
+        dirs.sort()
+        for item in sorted(files):
+            if item[-3:] == ".md":
+                content_item = os.path.join(root, item)
+                pages.append((content_item, page_dest_path(content_item, dir_path_content, dest_dir_path)))
+    return pages
+
+def page_dest_path(content_item, dir_path_content, dest_dir_path): # Every page becomes index.html in the matching output directory.
+    relative_dir = os.path.relpath(os.path.dirname(content_item), dir_path_content)
+    return os.path.normpath(os.path.join(dest_dir_path, relative_dir, "index.html"))
+
+def init_worker(template, cache, memo_size, memo_bytes):
+    global WORKER_TEMPLATE, WORKER_CACHE, WORKER_MEMO
+    WORKER_TEMPLATE = template
+    WORKER_CACHE = cache
+    WORKER_MEMO = new_memo(memo_size, memo_bytes)
+
+def render_page_job(source_path): # Runs inside a worker process; failures and timings are returned, not printed.
+    timer = BuildTimer()
+    try:
+        return render_page_file(source_path, WORKER_TEMPLATE, timer, WORKER_CACHE, WORKER_MEMO), None, timer.spans(), timer.counters
+    except Exception as e:
+        return None, describe_error(e), timer.spans(), timer.counters
+
+def generate_pages_parallel(dir_path_content, template_path, dest_dir_path, basepath, jobs, manifest=None, timer=None, cache=None, memo_size=0, memo_bytes=MEMO_BYTES):
+    if timer is None:
+        timer = BuildTimer()
+    with timer.span("discovery"):
+        pages = find_pages(dir_path_content, dest_dir_path)
+    if manifest is not None: # Skips pages whose inputs haven't changed.
+        with timer.span("check"):
+            pages = [(source, dest) for source, dest in pages if manifest.needs_build(source, dest)]
+    template = open_template(template_path, basepath)
 
-def main():
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    pages, large_pages = split_large_pages(pages)
+    errors = []
+    generate_streamed_pages(large_pages, template, timer, manifest, errors, new_memo(memo_size, memo_bytes))
+    if not pages:
+        return errors
+    chunksize = max(1, len(pages) // (jobs * 4)) # Batches small pages to keep the pickling overhead down.
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(template, cache, memo_size, memo_bytes)) as executor:
+        results = executor.map(render_page_job, [source for source, _ in pages], chunksize=chunksize)
+        for (source_path, dest_path), (html, error, spans, counters) in zip(pages, results): # Results come back in page order, so output is deterministic.
+            timer.merge(spans, source_path, counters)
+            if error is not None:
+                errors.append((source_path, error))
+                continue
+            with timer.span("write", source_path):
+                if write_page(dest_path, html):
+                    timer.count("writes_skipped")
+            if manifest is not None:
+                manifest.mark_built(source_path)
+    return errors
+
+def open_cache(args):
+    if args.no_cache:
+        return None
+    return RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+def new_memo(memo_size, memo_bytes):
+    return BlockMemo(memo_size, memo_bytes) if memo_size > 0 and memo_bytes > 0 else None
+
+def open_memo(args):
+    return new_memo(args.block_memo, args.block_memo_size * 1024 * 1024)
+
+def open_assets(args, manifest): # Hashes static/ once per build, so every template compiled afterwards rewrites asset URLs through the same table.
+    global ASSETS
+    ASSETS = AssetMap.scan("static", manifest.previous_assets) if args.fingerprint and os.path.isdir("static") else None
+    manifest.use_assets(ASSETS)
+    return ASSETS
+
+def update_headers(output_dir, assets, manifest): # Writes the _headers file for fingerprinted assets, or removes one an earlier build wrote.
+    headers_path = os.path.join(output_dir, HEADERS_NAME)
+    if assets is not None:
+        write_headers(headers_path, assets, os.path.join("static", HEADERS_NAME))
+    elif manifest.previous_asset_digest is not None and HEADERS_NAME not in manifest.static and os.path.exists(headers_path):
+        os.remove(headers_path)
+
+def static_output_files(output_dir): # Output paths of the static files; they are never treated as another file's sidecar.
+    return [os.path.join(output_dir, path) for path in list_output_files("static")] if os.path.isdir("static") else []
+
+def open_precompressor(args, output_dir):
+    if not args.precompress:
+        return None
+    return Precompressor(protected=static_output_files(output_dir))
+
+def remove_dropped_sidecars(output_dir, precompressor, manifest): # Removes sidecars an earlier build wrote that this one won't refresh, e.g. after --precompress is turned off.
+    current = precompressor.suffixes if precompressor is not None else ()
+    dropped = [suffix for suffix in manifest.previous_sidecars if suffix not in current]
+    manifest.sidecars = list(current)
+    if not dropped:
+        return []
+    return remove_sidecars(output_dir, dropped, set(static_output_files(output_dir)))
+
+def read_page_job(sources, read_queue, slots): # Reader thread: reads pages until `sources` runs dry.
+    while True:
+        try:
+            source_path, dest_path = sources.get_nowait()
+        except queue.Empty:
+            return
+        slots.acquire() # Blocks while too many pages are already in memory.
+        start = time.perf_counter()
+        try:
+            with open(source_path) as f:
+                markdown = f.read()
+            error = None
+        except Exception as e:
+            markdown, error = None, describe_error(e)
+        read_queue.put((source_path, dest_path, markdown, error, time.perf_counter() - start))
+
+def write_page_job(write_queue, results, slots): # Writer thread: writes pages until it receives None.
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        source_path, dest_path, page = item
+        start = time.perf_counter()
+        unchanged = False
+        try:
+            with open_page(dest_path) as f:
+                f.writelines(page)
+            unchanged = f.unchanged
+            error = None
+        except Exception as e:
+            error = describe_error(e)
+        results.append((source_path, time.perf_counter() - start, error, unchanged))
+        slots.release()
+
+def generate_pages_pipelined(dir_path_content, template_path, dest_dir_path, basepath, manifest=None, timer=None, cache=None, memo=None, readers=4, writers=4, in_flight=64):
+    if timer is None:
+        timer = BuildTimer()
+    with timer.span("discovery"):
+        pages = find_pages(dir_path_content, dest_dir_path)
+    if manifest is not None: # Skips pages whose inputs haven't changed.
+        with timer.span("check"):
+            pages = [(source, dest) for source, dest in pages if manifest.needs_build(source, dest)]
+    template = open_template(template_path, basepath)
+
+    pages, large_pages = split_large_pages(pages)
+    errors = []
+    generate_streamed_pages(large_pages, template, timer, manifest, errors, memo)
+    if not pages:
+        return errors
+    sources = queue.Queue()
+    for page in pages:
+        sources.put(page)
+    slots = threading.BoundedSemaphore(in_flight) # Held from the start of a read until the write finishes, so at most `in_flight` pages are in memory.
+    read_queue = queue.Queue(maxsize=in_flight)
+    write_queue = queue.Queue(maxsize=in_flight)
+    results = [] # list.append is atomic, so writers can share it without a lock.
+    threads = [threading.Thread(target=read_page_job, args=(sources, read_queue, slots), daemon=True) for _ in range(min(readers, len(pages)))]
+    threads += [threading.Thread(target=write_page_job, args=(write_queue, results, slots), daemon=True) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+
+    for _ in range(len(pages)): # Renders on this thread while the readers and writers keep the disk busy.
+        source_path, dest_path, markdown, error, read_seconds = read_queue.get()
+        timer.add("read", read_seconds, source_path)
+        if error is None:
+            if log.verbose:
+                log.detail(f"Generating page from {source_path} to {dest_path} using {template_path}")
+            try:
+                title, content_node = render_content(markdown, template, timer, source_path, cache, memo)
+                chunks = render_chunks(content_node, timer, source_path)
+                with timer.span("template", source_path):
+                    page = template.fill(title, chunks)
+            except Exception as e:
+                error = describe_error(e)
+        if error is not None:
+            errors.append((source_path, error))
+            slots.release()
+            continue
+        write_queue.put((source_path, dest_path, page))
+    for _ in range(writers):
+        write_queue.put(None)
+    for thread in threads:
+        thread.join()
+
+    for source_path, write_seconds, error, unchanged in results:
+        timer.add("write", write_seconds, source_path)
+        if unchanged:
+            timer.count("writes_skipped")
+        if error is not None:
+            errors.append((source_path, error))
+        elif manifest is not None:
+            manifest.mark_built(source_path)
+    errors.sort() # Pages finish out of order; sorting keeps the error report stable.
+    return errors
+
+def build_site(args, manifest, memo=None): # `memo` lets a long-running caller keep rendered blocks between builds.
+    timer = BuildTimer()
+    cache = open_cache(args)
+    staged = args.atomic or args.deploy_manifest # The live docs/ keeps serving the previous build until the new one is swapped in.
+    output_dir = "docs.staging" if staged else "docs"
+    if staged:
+        with timer.span("stage"):
+            prepare_staging("docs", output_dir, seed=manifest.exists) # Without a manifest there's no telling which outputs are stale, so start empty.
+        manifest.relocate("docs", output_dir)
+    elif not manifest.exists and os.path.exists("docs"): # Without a manifest there's no telling which outputs are stale.
+        shutil.rmtree("docs")
+        log.detail("Destination folder cleaned")
+    precompressor = open_precompressor(args, output_dir)
+    with precompressing(precompressor):
+        with timer.span("static"):
+            assets = open_assets(args, manifest)
+            manifest.static, sync_stats = sync_dir_contents("static", output_dir, manifest.previous_static, args.checksum, args.link_static,
+                precompressor.add if precompressor is not None else None, assets)
+            update_headers(output_dir, assets, manifest)
+        if args.jobs > 1:
+            for source_path, error in generate_pages_parallel("content", "template.html", output_dir, args.basepath, args.jobs, manifest, timer, cache, args.block_memo, args.block_memo_size * 1024 * 1024):
+                log.error(f"Could not generate page from {source_path}: {error}")
+        elif args.pipeline:
+            for source_path, error in generate_pages_pipelined("content", "template.html", output_dir, args.basepath, manifest, timer, cache, memo if memo is not None else open_memo(args), args.readers, args.writers, args.in_flight):
+                log.error(f"Could not generate page from {source_path}: {error}")
+        else:
+            generate_pages_recursive("content", "template.html", output_dir, args.basepath, manifest, timer=timer, cache=cache, memo=memo if memo is not None else open_memo(args))
+    stale_pages = manifest.remove_stale_outputs()
+    if log.verbose:
+        for dest_page in stale_pages:
+            log.detail(f"Stale page removed: {dest_page}")
+    with timer.span("compress"):
+        for sidecar in remove_dropped_sidecars(output_dir, precompressor, manifest): # Left in place, they would be served instead of the pages they no longer match.
+            if log.verbose:
+                log.detail(f"Stale sidecar removed: {sidecar}")
+        if precompressor is not None:
+            precompressor.sweep(output_dir) # After stale pages are gone, so their sidecars go too.
+            for error in precompressor.close():
+                log.error(f"Could not precompress output: {error}")
+    failed = len(manifest.pending) # Pages that needed a build but were never written.
+    if staged:
+        manifest.relocate(output_dir, "docs")
+        with timer.span("swap"):
+            changes = diff_output_trees("docs", output_dir)
+            swap_output(output_dir, "docs") # Before the manifest is saved, so it never describes outputs that aren't live.
+        if args.deploy_manifest:
+            write_deploy_manifest(args.deploy_manifest, changes)
+    manifest.save()
+    if cache is not None and timer.counters.get("cache_misses"): # Only new entries can push the cache over its budget.
+        cache.prune()
+    if log.normal:
+        log.info(f"Built {manifest.built} pages ({manifest.skipped} unchanged, {timer.counters.get('cache_hits', 0)} from cache, {failed} failed, {len(stale_pages)} stale removed, {timer.counters.get('writes_skipped', 0)} identical writes skipped), "
+            f"static files {sync_stats['copied']} copied ({sync_stats['unchanged']} unchanged, {sync_stats['removed']} removed) "
+            f"in {timer.elapsed():.2f}s")
+        if assets is not None:
+            log.info(f"Fingerprinted {len(assets.files)} static files, marked immutable in {HEADERS_NAME}")
+        if precompressor is not None:
+            log.info(f"Precompressed {precompressor.stats['compressed']} files as {', '.join(precompressor.suffixes)} ({precompressor.stats['reused']} reused, {precompressor.stats['skipped']} skipped)")
+        if staged:
+            log.info(f"Output swapped in: {len(changes['added'])} added, {len(changes['changed'])} changed, {len(changes['removed'])} removed, {changes['unchanged']} unchanged")
+    if args.timings:
+        timer.write_json(args.timings, args.slowest)
+    if args.prometheus:
+        timer.write_prometheus(args.prometheus)
+
+def rebuild_changes(changed, removed, template, manifest, args, memo=None): # Applies one batch of file changes in place.
+    static_files = set(manifest.static)
+    cache = open_cache(args)
+    precompressor = open_precompressor(args, "docs")
+    for path in removed:
+        if path.startswith("static" + os.sep):
+            relative_path = os.path.relpath(path, "static")
+            static_files.discard(relative_path)
+            dest_item = os.path.join("docs", relative_path)
+            if os.path.isfile(dest_item):
+                os.remove(dest_item)
+                if precompressor is not None:
+                    precompressor.discard(dest_item)
+                if log.verbose:
+                    log.detail(f"Orphaned file removed: {dest_item}")
+        elif path.startswith("content" + os.sep) and path[-3:] == ".md":
+            dest_page = manifest.forget_page(path)
+            if dest_page and os.path.exists(dest_page):
+                os.remove(dest_page)
+                if precompressor is not None:
+                    precompressor.discard(dest_page)
+                if log.verbose:
+                    log.detail(f"Stale page removed: {dest_page}")
+    for path in changed:
+        if path.startswith("static" + os.sep):
+            relative_path = os.path.relpath(path, "static")
+            dest_item = os.path.join("docs", relative_path)
+            os.makedirs(os.path.dirname(dest_item), exist_ok=True)
+            copy_file(path, dest_item, args.link_static)
+            static_files.add(relative_path)
+            if precompressor is not None:
+                precompressor.add(dest_item)
+            if log.verbose:
+                log.detail(f"File copied: {path}")
+        elif path.startswith("content" + os.sep) and path[-3:] == ".md":
+            dest_page = page_dest_path(path, "content", "docs")
+            try:
+                if manifest.needs_build(path, dest_page):
+                    with precompressing(precompressor):
+                        generate_page(path, "template.html", dest_page, args.basepath, template, cache=cache, memo=memo)
+                    manifest.mark_built(path)
+            except Exception as e:
+                log.error(f"Could not generate page from {path}: {describe_error(e)}")
+    if precompressor is not None:
+        for error in precompressor.close():
+            log.error(f"Could not precompress output: {error}")
+    manifest.static = sorted(static_files)
+    manifest.save()
+
+def rebuild_batch(changed, removed, template, manifest, args, memo=None): # Applies one batch of changes; returns the template and manifest to keep using.
+    template_changed = "template.html" in changed or "template.html" in removed
+    assets_changed = args.fingerprint and any(path.startswith("static" + os.sep) for path in changed + removed)
+    if template_changed or assets_changed: # A template change invalidates every page; a new asset hash changes the URLs in them.
+        if template_changed:
+            manifest = BuildManifest(".build-manifest.json", "template.html", args.basepath, args.minify)
+        build_site(args, manifest, memo) # Block HTML doesn't depend on the template, and the asset digest is part of every key.
+        template = open_template("template.html", args.basepath)
     else:
-        basepath = "/"
-    copy_dir_contents("static", "docs")
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+        rebuild_changes(changed, removed, template, manifest, args, memo)
+    return template, manifest
+
+def watch_site(args, manifest): # Stays resident and rebuilds only what changed, keeping the template and manifest warm.
+    watched_paths = ["content", "static", "template.html"]
+    template = open_template("template.html", args.basepath)
+    memo = open_memo(args) # Kept for the life of the process, so an edit only re-renders the blocks it touched.
+    snapshot = take_snapshot(watched_paths)
+    manifest.reset_for_rebuild()
+    log.info(f"Watching {', '.join(watched_paths)} for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = take_snapshot(watched_paths)
+            changed, removed = diff_snapshots(snapshot, current)
+            if not changed and not removed:
+                continue
+            if not os.path.exists("template.html"): # Editors that save atomically move it away for a moment; the held-back changes are applied once it's back.
+                continue
+            snapshot = current
+            start = time.perf_counter()
+            try:
+                template, manifest = rebuild_batch(changed, removed, template, manifest, args, memo)
+            except Exception as e: # A failed batch is reported, and the next change gets a fresh attempt.
+                log.error(f"Rebuild failed: {describe_error(e)}")
+            else:
+                log.info(f"Rebuilt {len(changed) + len(removed)} changed file(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+            manifest.reset_for_rebuild()
+    except KeyboardInterrupt:
+        log.info("Stopped watching")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Builds the site from content/ and static/ into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix for root-relative links (default: /)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes for page generation, 0 for one per CPU (default: 1)")
+    parser.add_argument("--pipeline", action="store_true", help="overlap reading and writing pages with rendering using reader and writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="reader threads in pipeline mode (default: 4)")
+    parser.add_argument("--writers", type=int, default=4, help="writer threads in pipeline mode (default: 4)")
+    parser.add_argument("--in-flight", type=int, default=64, help="most pages held in memory at once in pipeline mode (default: 64)")
+    parser.add_argument("--stream-threshold", type=int, default=64, help="pages of at least this many MB are parsed and written block by block from a memory map (default: 64)")
+    parser.add_argument("--checksum", action="store_true", help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--link-static", action="store_true", help="hardlink static files into docs/ instead of copying them")
+    parser.add_argument("--atomic", action="store_true", help="build into docs.staging/ and swap it in with a rename, so docs/ is never half-built")
+    parser.add_argument("--deploy-manifest", metavar="PATH", help="write a JSON list of the added, changed and removed output files with their hashes (implies --atomic)")
+    parser.add_argument("--minify", action="store_true", help="collapse whitespace, unquote attributes and drop optional end tags in every page; <pre> blocks are left as they are")
+    parser.add_argument("--fingerprint", action="store_true", help="also copy static files as name.<hash>.ext, point the template and page links at those names, and mark them immutable in docs/_headers")
+    parser.add_argument("--precompress", action="store_true", help="write .gz sidecars, plus .br and .zst where brotli or zstd is available, next to every compressible output file")
+    parser.add_argument("--watch", action="store_true", help="stay running and rebuild whatever changes in content/, static/ or template.html")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between checks for changes in watch mode (default: 0.2)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-q", "--quiet", dest="log_level", action="store_const", const=QUIET, default=NORMAL, help="only report errors")
+    verbosity.add_argument("-v", "--verbose", dest="log_level", action="store_const", const=VERBOSE, help="report every file copied, generated or removed")
+    parser.add_argument("--cache-dir", default=".render-cache", help="directory for cached page HTML, keyed by markdown content (default: .render-cache)")
+    parser.add_argument("--cache-size", type=int, default=256, help="size limit of the render cache in MB; least recently used pages are evicted first (default: 256)")
+    parser.add_argument("--no-cache", action="store_true", help="render every page from scratch without reading or writing the render cache")
+    parser.add_argument("--block-memo", type=int, default=4096, help="number of rendered blocks remembered for reuse by identical blocks on other pages, 0 to disable (default: 4096)")
+    parser.add_argument("--block-memo-size", type=int, default=16, help="size limit of the block memo in MB; blocks over 1/64 of it are never memoized (default: 16)")
+    parser.add_argument("--trace", metavar="PAGE", help="print the parser's block splits, classifications and inline splits for one markdown file instead of building")
+    parser.add_argument("--timings", metavar="PATH", help="write a JSON report of time spent per build phase and the slowest pages")
+    parser.add_argument("--prometheus", metavar="PATH", help="write build phase timings as a Prometheus textfile (.prom)")
+    parser.add_argument("--slowest", type=int, default=10, help="number of slowest pages listed in the timings report (default: 10)")
+    args = parser.parse_args(argv)
+    for option in ("readers", "writers", "in_flight"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    log.set_level(args.log_level)
+    global STREAM_THRESHOLD, MINIFY
+    STREAM_THRESHOLD = args.stream_threshold * 1024 * 1024
+    MINIFY = args.minify
+    if args.trace:
+        trace_page(args.trace, args.basepath)
+        return
+    manifest = BuildManifest(".build-manifest.json", "template.html", args.basepath, args.minify)
+    build_site(args, manifest)
+    if args.watch:
+        watch_site(args, manifest)
 
 if __name__ == "__main__":
     main()
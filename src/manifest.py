@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): # Reads in 1 MiB chunks so large files don't sit in memory.
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BuildManifest ():
+    def __init__(self, path, template_path, basepath, minify=False):
+        self.path = path
+        self.template_hash = hash_file(template_path)
+        self.basepath = basepath
+        self.minify = minify
+        data = self.load()
+        self.exists = data is not None
+        self.recorded = (data or {}).get("pages", {}) # Every page the last build wrote, used to find stale outputs.
+        self.previous = self.recorded if self.matches(data) else None
+        self.previous_static = (data or {}).get("static", [])
+        self.previous_assets = (data or {}).get("assets", {})
+        self.previous_asset_digest = (data or {}).get("asset_digest")
+        self.previous_sidecars = (data or {}).get("sidecars", []) # Suffixes of the compressed sidecars the last build left in the output.
+        self.pages = {}
+        self.pending = {}
+        self.static = []
+        self.assets = {}
+        self.asset_digest = None
+        self.sidecars = []
+        self.skipped = 0
+        self.built = 0
+
+    def load(self): # Returns the previous manifest, or None if there isn't a readable one.
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return data
+
+    def matches(self, data): # A template, basepath or minify change invalidates every page.
+        return data is not None and \
+            data.get("template") == self.template_hash and \
+            data.get("basepath") == self.basepath and \
+            data.get("minify", False) == self.minify
+
+    @property
+    def is_valid(self):
+        return self.previous is not None
+
+    def needs_build(self, source_path, dest_path):
+        stat = os.stat(source_path)
+        old = (self.previous or {}).get(source_path)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            source_hash = old["hash"] # Untouched since the last build, so the stored hash is still good.
+        else:
+            source_hash = hash_file(source_path)
+        entry = {"hash": source_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "dest": dest_path}
+        if old and old["hash"] == source_hash and old["dest"] == dest_path and os.path.exists(dest_path):
+            self.pages[source_path] = entry
+            self.skipped += 1
+            return False
+        self.pending[source_path] = entry # Only recorded once the page has actually been written.
+        return True
+
+    def mark_built(self, source_path):
+        self.pages[source_path] = self.pending.pop(source_path)
+        self.built += 1
+
+    def forget_page(self, source_path): # Drops a deleted page and returns its output path, if it had one.
+        entry = self.pages.pop(source_path, None)
+        return entry["dest"] if entry else None
+
+    def relocate(self, old_dir, new_dir): # Points recorded outputs under old_dir at new_dir instead, e.g. while building into a staging tree.
+        prefix = os.path.join(old_dir, "")
+        def moved(entries):
+            return {
+                source_path: {**entry, "dest": os.path.join(new_dir, entry["dest"][len(prefix):])} if entry["dest"].startswith(prefix) else entry
+                for source_path, entry in entries.items()
+            }
+        is_previous = self.previous is self.recorded
+        self.recorded = moved(self.recorded)
+        if is_previous:
+            self.previous = self.recorded
+        self.pages = moved(self.pages)
+        self.pending = moved(self.pending)
+
+    def use_assets(self, assets): # Fingerprinted asset URLs are baked into every page, so a different set of assets invalidates them all.
+        self.assets = assets.files if assets is not None else {}
+        self.asset_digest = assets.digest if assets is not None else None
+        if self.asset_digest != self.previous_asset_digest:
+            self.previous = None
+
+    def reset_for_rebuild(self): # Lets a resident process reuse this manifest for its next incremental build.
+        self.recorded = dict(self.pages)
+        self.previous = self.recorded
+        self.previous_static = list(self.static)
+        self.previous_assets = self.assets
+        self.previous_asset_digest = self.asset_digest
+        self.previous_sidecars = list(self.sidecars)
+        self.pending = {}
+        self.skipped = 0
+        self.built = 0
+
+    def remove_stale_outputs(self): # Deletes pages whose source file no longer exists.
+        current_dests = {entry["dest"] for entry in self.pages.values()}
+        current_dests.update(entry["dest"] for entry in self.pending.values())
+        removed = []
+        for source_path, entry in self.recorded.items():
+            if source_path in self.pages or source_path in self.pending or entry["dest"] in current_dests:
+                continue
+            if os.path.exists(entry["dest"]):
+                os.remove(entry["dest"])
+                removed.append(entry["dest"])
+        return removed
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": self.template_hash,
+            "basepath": self.basepath,
+            "minify": self.minify,
+            "pages": self.pages,
+            "static": self.static,
+            "assets": self.assets,
+            "asset_digest": self.asset_digest,
+            "sidecars": self.sidecars,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path) # Swaps in atomically so an interrupted build never leaves a corrupt manifest.
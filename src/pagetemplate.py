@@ -0,0 +1,84 @@
+import re
+import time
+
+from htmlminify import HtmlMinifier
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="(/[^"]*)"')
+
+def rewrite_url(url, basepath, assets=None): # Points asset URLs at their fingerprinted names, then prefixes root-relative URLs with the basepath.
+    if assets is not None and url:
+        url = assets.resolve(url)
+    if basepath and url and url.startswith("/"):
+        return f"{basepath}{url[1:]}"
+    return url
+
+class PageTemplate ():
+    def __init__(self, template, basepath="/", minify=False, assets=None):
+        self.basepath = basepath
+        self.minify = minify # Minifies each page while it's filled in, rather than the finished page afterwards.
+        self.assets = assets # AssetMap of fingerprinted static files, or None; rendered links resolve through it too.
+        if assets is not None:
+            template = URL_ATTRIBUTE_PATTERN.sub(lambda match: f'{match.group(1)}="{assets.resolve(match.group(2))}"', template)
+        template = template.replace('href="/', f'href="{basepath}') # Rewritten once here instead of on every page.
+        template = template.replace('src="/', f'src="{basepath}')
+        pieces = PLACEHOLDER_PATTERN.split(template) # Alternates static text and placeholder names.
+        self.segments = pieces[0::2]
+        self.slots = pieces[1::2]
+
+    @classmethod
+    def from_file(cls, template_path, basepath="/", minify=False, assets=None):
+        with open(template_path) as f:
+            return cls(f.read(), basepath, minify, assets)
+
+    def render(self, title, content):
+        return "".join(self.fill(title, [content]))
+
+    def fill(self, title, content_chunks): # Returns the page as a list of chunks, ready for writelines().
+        parts = []
+        if self.minify:
+            minifier = HtmlMinifier(parts.append)
+            add = minifier.write
+        else:
+            add = parts.append
+        add(self.segments[0])
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            if slot == "Content":
+                if self.minify:
+                    for chunk in content_chunks:
+                        add(chunk)
+                else:
+                    parts.extend(content_chunks)
+            else:
+                add(title)
+            add(segment)
+        if self.minify:
+            minifier.close()
+        return parts
+
+    def write(self, out, title, content_node): # Streams the page into `out`, serializing the content node in place.
+        # Returns the seconds spent serializing the content and filling in the rest of the template,
+        # leaving out any time a PageWriter reports for its own writes in between.
+        writer = out
+        if self.minify:
+            out = HtmlMinifier(out.write)
+        start = time.perf_counter()
+        writer_start = getattr(writer, "seconds", 0.0)
+        content_seconds = 0.0
+        out.write(self.segments[0])
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            if slot == "Content":
+                content_start = time.perf_counter()
+                content_writer_start = getattr(writer, "seconds", 0.0)
+                content_node.write_html(out)
+                content_seconds += time.perf_counter() - content_start - (getattr(writer, "seconds", 0.0) - content_writer_start)
+            else:
+                out.write(title)
+            out.write(segment)
+        if self.minify:
+            out.close()
+        template_seconds = time.perf_counter() - start - (getattr(writer, "seconds", 0.0) - writer_start) - content_seconds
+        return content_seconds, template_seconds
+
+    def __repr__(self):
+        return f"PageTemplate(slots={self.slots!r}, basepath={self.basepath!r}, minify={self.minify!r}, assets={self.assets!r})"
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import time
+
+from manifest import hash_file
+
+BATCH_SIZE = 64 * 1024 # Characters collected before one encode, hash and write; small chunks stay cheap without holding the page.
+
+class PageWriter (): # File-like wrapper that hashes everything written through it.
+    def __init__(self, f, keep=False):
+        self.f = f
+        self.chunks = [] if keep else None # The encoded bytes, kept for whoever needs the page again, e.g. to compress it.
+        self.pending = [] # Text not yet encoded; never more than about BATCH_SIZE characters.
+        self.pending_size = 0
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.seconds = 0.0 # Time spent encoding, hashing and writing, for the build timer.
+        self.unchanged = False # Set once the page is closed, if the existing file already held the same bytes.
+
+    def write(self, text):
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size >= BATCH_SIZE:
+            self.flush()
+
+    def writelines(self, chunks):
+        write = self.write
+        for chunk in chunks:
+            write(chunk)
+
+    def flush(self): # Called by open_page() before the page is compared or closed.
+        if not self.pending:
+            return
+        start = time.perf_counter()
+        data = "".join(self.pending).encode()
+        self.pending = []
+        self.pending_size = 0
+        self.digest.update(data)
+        self.size += len(data)
+        self.f.write(data)
+        if self.chunks is not None:
+            self.chunks.append(data)
+        self.seconds += time.perf_counter() - start
+
+    def data(self): # None unless the writer was told to keep the bytes.
+        return b"".join(self.chunks) if self.chunks is not None else None
+
+    def matches(self, dest_path): # Compares against the file already on disk; a size mismatch settles it without reading the file.
+        try:
+            if os.stat(dest_path).st_size != self.size:
+                return False
+            return hash_file(dest_path) == self.digest.hexdigest()
+        except OSError:
+            return False
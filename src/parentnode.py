@@ -2,26 +2,30 @@ from htmlnode import HTMLNode
 from leafnode import LeafNode
 
 class ParentNode (HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, children=None, props=None):
         self.tag = tag
+        self.value = None
         self.children = children or []
         self.props = props
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def html_parts(self):
         if not self.tag:
             raise ValueError("Missing tag")
         if not self.children:
             raise ValueError("No children")
         
-        children_html = [child.to_html() for child in self.children]
-        
         # Create properties string if props exist
         props_html = ""
         if self.props:
             for key, value in self.props.items():
                 props_html += f' {key}="{value}"'
         
-        return f"<{self.tag}{props_html}>{''.join(children_html)}</{self.tag}>"
+        return f"<{self.tag}{props_html}>", self.children, f"</{self.tag}>"
     
     def __repr__(self):
         if self.props is None:
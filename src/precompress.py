@@ -0,0 +1,142 @@
+import gzip
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+INCOMPRESSIBLE = frozenset((
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif",
+    ".woff", ".woff2", ".mp3", ".mp4", ".webm", ".ogg",
+    ".zip", ".gz", ".br", ".zst", ".xz", ".bz2", ".7z",
+)) # Already compressed, so a sidecar would only cost build time.
+MIN_SIZE = 256 # Smaller files fit in a packet either way.
+
+def available_codecs(): # (suffix, compress) for every codec this interpreter has; only gzip is guaranteed.
+    codecs = [(".gz", lambda data: gzip.compress(data, 9, mtime=0))] # A fixed mtime keeps sidecars byte-identical across builds.
+    try:
+        import brotli
+        codecs.append((".br", lambda data: brotli.compress(data, quality=11)))
+    except ImportError:
+        pass
+    try:
+        from compression import zstd # Standard library from Python 3.14.
+        codecs.append((".zst", lambda data: zstd.compress(data, 19)))
+    except ImportError:
+        try:
+            import zstandard
+            codecs.append((".zst", lambda data: zstandard.ZstdCompressor(level=19).compress(data))) # A compressor object can't be shared between threads.
+        except ImportError:
+            pass
+    return codecs
+
+def remove_sidecars(root, suffixes, protected=()): # Deletes every sidecar with one of `suffixes` under root, e.g. once precompression is turned off. Returns their paths.
+    removed = []
+    suffixes = tuple(suffixes)
+    for dir_path, _, names in os.walk(root):
+        present = set(names)
+        for name in sorted(names):
+            path = os.path.join(dir_path, name)
+            suffix = next((suffix for suffix in suffixes if name.endswith(suffix)), None)
+            if suffix is not None and name[:-len(suffix)] in present and path not in protected:
+                os.remove(path)
+                removed.append(path)
+    return removed
+
+class Precompressor ():
+    def __init__(self, codecs=None, workers=None, protected=()):
+        self.codecs = codecs if codecs is not None else available_codecs()
+        self.suffixes = tuple(suffix for suffix, _ in self.codecs)
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) # zlib, brotli and zstd release the GIL while compressing.
+        self.protected = set(protected) # Paths that are real output files, e.g. a static archive.tar.gz, never sidecars to write or remove.
+        self.handled = set()
+        self.futures = []
+        self.errors = []
+        self.stats = {"compressed": 0, "reused": 0, "skipped": 0}
+        self.lock = threading.Lock() # Pipeline writer threads hand over pages concurrently.
+
+    def is_fresh(self, path): # Every sidecar exists and was written after the file last changed.
+        mtime_ns = os.stat(path).st_mtime_ns
+        for suffix in self.suffixes:
+            try:
+                if os.stat(path + suffix).st_mtime_ns < mtime_ns:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def add(self, path, data=None, unchanged=False): # Queues the sidecars for one output file; `data` is its bytes if the caller still has them.
+        size = len(data) if data is not None else os.path.getsize(path)
+        with self.lock:
+            self.handled.add(path)
+        if os.path.splitext(path)[1].lower() in INCOMPRESSIBLE:
+            self.count("skipped")
+        elif size < MIN_SIZE:
+            self.discard(path) # In case an earlier, larger version had sidecars.
+            self.count("skipped")
+        elif unchanged and self.is_fresh(path):
+            self.count("reused")
+        else:
+            future = self.executor.submit(self.compress, path, data)
+            with self.lock:
+                self.futures.append(future)
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def compress(self, path, data):
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        for suffix, compress in self.codecs:
+            sidecar = path + suffix
+            if sidecar in self.protected:
+                continue
+            compressed = compress(data)
+            if len(compressed) >= len(data): # Not worth serving; drop any sidecar left from an earlier version.
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+                continue
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(sidecar)}.", suffix=".tmp", dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, sidecar) # Replaced rather than rewritten, so a hardlinked copy of the old sidecar is left alone.
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self.count("compressed")
+
+    def wait(self):
+        with self.lock:
+            futures, self.futures = self.futures, []
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                self.errors.append(f"{type(error).__name__}: {error}")
+
+    def discard(self, path): # Removes the sidecars of an output file that was deleted.
+        for suffix in self.suffixes:
+            sidecar = path + suffix
+            if sidecar not in self.protected and os.path.exists(sidecar):
+                os.remove(sidecar)
+
+    def sweep(self, root): # Covers the files no writer handed over, e.g. pages the manifest skipped, and removes orphaned sidecars.
+        self.wait() # Nothing is mid-write while the tree is walked.
+        for dir_path, _, names in os.walk(root):
+            present = set(names)
+            for name in sorted(names):
+                path = os.path.join(dir_path, name)
+                if path in self.handled or (path in self.protected and name.endswith(self.suffixes)):
+                    continue
+                suffix = next((suffix for suffix in self.suffixes if name.endswith(suffix)), None)
+                if suffix is not None:
+                    if name[:-len(suffix)] not in present:
+                        os.remove(path)
+                    continue
+                self.add(path, unchanged=True)
+
+    def close(self): # Waits for every queued sidecar and returns the errors, if any.
+        self.wait()
+        self.executor.shutdown()
+        return self.errors
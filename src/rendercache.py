@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+
+CACHE_FORMAT = 1
+RENDERER_MODULES = ("main.py", "blocknode.py", "textnode.py", "htmlnode.py", "leafnode.py", "parentnode.py", "pagetemplate.py", "fingerprint.py") # Everything that shapes a page's content HTML, including link rewriting.
+
+def renderer_version(): # Hashes the renderer's own source, so any code change starts a fresh set of keys.
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}\n".encode())
+    for name in RENDERER_MODULES:
+        with open(os.path.join(src_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class RenderCache ():
+    def __init__(self, path, max_bytes, version=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version if version is not None else renderer_version()
+
+    def key(self, markdown, basepath, assets=None): # Links are rewritten during rendering, so the basepath and asset fingerprints are part of the key.
+        digest = hashlib.sha256(f"{self.version}\0{basepath}\0".encode())
+        if assets is not None:
+            digest.update(f"{assets.digest}\0".encode())
+        digest.update(markdown.encode())
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.html")
+
+    def get(self, key): # Returns the cached content HTML, or None on a miss.
+        entry_path = self.entry_path(key)
+        try:
+            with open(entry_path) as f:
+                html = f.read()
+            os.utime(entry_path) # Marks the entry as recently used for eviction.
+        except OSError: # Missing, or evicted by another build between the open and the utime.
+            return None
+        return html
+
+    def put(self, key, html): # Safe with several writers: each writes its own temporary file and renames it into place.
+        entry_path = self.entry_path(key)
+        entry_dir = os.path.dirname(entry_path)
+        os.makedirs(entry_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=entry_dir)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(html)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self): # Evicts the least recently used entries until the cache fits its byte budget. Returns the number removed.
+        entries = []
+        total = 0
+        if not os.path.isdir(self.path):
+            return 0
+        for bucket in os.scandir(self.path):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+        entries.sort()
+        removed = 0
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError: # Already evicted by a concurrent build.
+                pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+
+from manifest import hash_file
+from buildtimer import write_atomic
+
+DEPLOY_MANIFEST_VERSION = 1
+
+def link_file(source_path, dest_path): # Shares the inode instead of copying; falls back to a copy across filesystems.
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copy2(source_path, dest_path)
+
+def prepare_staging(output_dir, staging_dir, seed=True): # Starts the staging tree as hardlinks of the live output.
+    if os.path.lexists(staging_dir): # Left behind by an interrupted build.
+        shutil.rmtree(staging_dir)
+    if seed and os.path.isdir(output_dir):
+        shutil.copytree(output_dir, staging_dir, copy_function=link_file) # Every writer replaces files instead of writing into them, so the live tree is never modified through a link.
+    else:
+        os.makedirs(staging_dir)
+
+def swap_output(staging_dir, output_dir): # Two renames, so the output is only missing between them rather than for the whole build.
+    old_dir = f"{output_dir}.old"
+    if os.path.lexists(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.exists(output_dir):
+        os.rename(output_dir, old_dir)
+    os.rename(staging_dir, output_dir)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+
+def list_output_files(root): # Relative path -> stat result for every file under root.
+    files = {}
+    for dir_path, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dir_path, name)
+            files[os.path.relpath(path, root)] = os.stat(path)
+    return files
+
+def diff_output_trees(old_dir, new_dir): # Lists the added, changed and removed files, with the new content hash of each added or changed one.
+    old_files = list_output_files(old_dir)
+    new_files = list_output_files(new_dir)
+    changes = {"added": {}, "changed": {}, "removed": [], "unchanged": 0}
+    for relative_path, stat in sorted(new_files.items()):
+        old_stat = old_files.get(relative_path)
+        if old_stat is not None and (old_stat.st_dev, old_stat.st_ino) == (stat.st_dev, stat.st_ino): # Still linked to the live file, so never rewritten.
+            changes["unchanged"] += 1
+            continue
+        new_hash = hash_file(os.path.join(new_dir, relative_path))
+        url_path = relative_path.replace(os.sep, "/")
+        if old_stat is None:
+            changes["added"][url_path] = new_hash
+        elif old_stat.st_size != stat.st_size or hash_file(os.path.join(old_dir, relative_path)) != new_hash:
+            changes["changed"][url_path] = new_hash
+        else: # Rewritten with identical bytes.
+            changes["unchanged"] += 1
+    changes["removed"] = sorted(path.replace(os.sep, "/") for path in old_files if path not in new_files)
+    return changes
+
+def write_deploy_manifest(path, changes):
+    data = {
+        "version": DEPLOY_MANIFEST_VERSION,
+        "added": changes["added"],
+        "changed": changes["changed"],
+        "removed": changes["removed"],
+    }
+    write_atomic(path, json.dumps(data, indent=1, sort_keys=True) + "\n")
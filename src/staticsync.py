@@ -0,0 +1,93 @@
+import os
+import shutil
+
+from manifest import hash_file
+from buildlog import log
+
+def copy_file_contents(source_path, dest_path): # Lets the kernel copy the data where it can.
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source_path, "rb") as fsrc, open(dest_path, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError: # Unsupported by this kernel or filesystem.
+            pass
+    shutil.copyfile(source_path, dest_path)
+
+def copy_file(source_path, dest_path, link=False):
+    if os.path.lexists(dest_path):
+        os.remove(dest_path) # Breaks any existing hardlink so the source is never written through it.
+    if link:
+        try:
+            os.link(source_path, dest_path)
+            return
+        except OSError: # Falls back to copying across filesystems.
+            pass
+    copy_file_contents(source_path, dest_path)
+    shutil.copystat(source_path, dest_path) # Keeps the mtime so the next sync can compare it.
+
+def is_unchanged(source_path, dest_path, checksum=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source_path)
+    if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino): # Already hardlinked.
+        return True
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return hash_file(source_path) == hash_file(dest_path)
+    return source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def sync_dir_contents(source_path, dest_path, previous_files=(), checksum=False, link=False, on_copy=None, assets=None): # on_copy is called with each destination file that was copied; `assets` adds a fingerprinted copy of each asset it names.
+    source_path = os.path.normpath(source_path)
+    dest_path = os.path.normpath(dest_path)
+    if not os.path.exists(source_path):
+        raise Exception(f"Invalid source path: {source_path}")
+
+    files = []
+    stats = {"copied": 0, "unchanged": 0, "removed": 0}
+    for root, dirs, names in os.walk(source_path):
+        dirs.sort()
+        relative_dir = os.path.relpath(root, source_path)
+        dest_dir = os.path.normpath(os.path.join(dest_path, relative_dir))
+        os.makedirs(dest_dir, exist_ok=True)
+        for name in sorted(names):
+            source_item = os.path.join(root, name)
+            dest_item = os.path.join(dest_dir, name)
+            relative_path = os.path.normpath(os.path.join(relative_dir, name))
+            files.append(relative_path)
+            if is_unchanged(source_item, dest_item, checksum):
+                stats["unchanged"] += 1
+            else:
+                copy_file(source_item, dest_item, link)
+                stats["copied"] += 1
+                if on_copy is not None:
+                    on_copy(dest_item)
+                if log.verbose:
+                    log.detail(f"File copied: {source_item}")
+            fingerprinted = assets.output_name(relative_path) if assets is not None else None
+            if fingerprinted is not None:
+                files.append(fingerprinted) # Listed like any other copy, so the name of an older version is removed as an orphan.
+                fingerprinted_item = os.path.join(dest_path, fingerprinted)
+                if not is_unchanged(dest_item, fingerprinted_item):
+                    copy_file(dest_item, fingerprinted_item, link=True) # Shares the plain copy's inode; the name only changes with the content.
+                    if on_copy is not None:
+                        on_copy(fingerprinted_item)
+
+    current_files = set(files)
+    for relative_path in previous_files: # Only removes files an earlier sync copied, never generated pages.
+        dest_item = os.path.join(dest_path, relative_path)
+        if relative_path not in current_files and os.path.isfile(dest_item):
+            os.remove(dest_item)
+            stats["removed"] += 1
+            if log.verbose:
+                log.detail(f"Orphaned file removed: {dest_item}")
+    return files, stats
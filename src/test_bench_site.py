@@ -0,0 +1,25 @@
+import unittest
+
+from benchmarks.bench_site import find_regressions
+
+
+class TestFindRegressions(unittest.TestCase):
+    def metrics(self, seconds):
+        return {"seconds": seconds, "pages_per_second": 100 / seconds, "peak_rss_kb": 1000, "output_bytes": 5000, "noop_seconds": 0.1}
+
+    def test_within_threshold(self):
+        self.assertEqual(find_regressions({"100": self.metrics(1.05)}, {"100": self.metrics(1.0)}, 0.1), [])
+
+    def test_slower(self):
+        self.assertEqual(find_regressions({"100": self.metrics(1.5)}, {"100": self.metrics(1.0)}, 0.1), [
+            "100 pages: seconds 1 -> 1.5 (+50% worse)",
+            "100 pages: pages_per_second 100 -> 66.67 (+33% worse)",
+        ])
+
+    def test_size_missing_from_baseline(self):
+        regressions = find_regressions({"20": self.metrics(1.0), "40": self.metrics(2.0)}, {"20": self.metrics(1.0)}, 0.1)
+        self.assertEqual(regressions, ["40 pages: not in the baseline, record it with --update-baseline"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from blockmemo import BlockMemo
+
+
+class TestBlockMemo(unittest.TestCase):
+    def test_miss_then_hit(self):
+        memo = BlockMemo()
+        self.assertIsNone(memo.get("a"))
+        memo.put("a", "<p>a</p>")
+        self.assertEqual(memo.get("a"), "<p>a</p>")
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+    def test_empty_html_is_a_hit(self):
+        memo = BlockMemo()
+        memo.put("a", "")
+        self.assertEqual(memo.get("a"), "")
+        self.assertEqual(memo.hits, 1)
+
+    def test_evicts_least_recently_used(self):
+        memo = BlockMemo(2)
+        memo.put("a", "A")
+        memo.put("b", "B")
+        memo.get("a")
+        memo.put("c", "C")
+        self.assertEqual(len(memo), 2)
+        self.assertIsNone(memo.get("b"))
+        self.assertEqual(memo.get("a"), "A")
+        self.assertEqual(memo.get("c"), "C")
+
+    def test_evicts_over_byte_budget(self):
+        memo = BlockMemo(max_bytes=64 * 10)
+        for n in range(64):
+            memo.put(n, "x" * 10)
+        self.assertEqual((len(memo), memo.size), (64, 640))
+        memo.put("a", "A", size=5)
+        self.assertIsNone(memo.get(0))
+        self.assertEqual((len(memo), memo.size), (64, 635))
+        memo.put(1, "B") # Replacing an entry replaces its size.
+        self.assertEqual(memo.size, 626)
+
+    def test_skips_oversize_entries(self):
+        memo = BlockMemo(max_bytes=64 * 10)
+        self.assertFalse(memo.fits(11))
+        memo.put("a", "A" * 11)
+        self.assertEqual((len(memo), memo.size), (0, 0))
+        self.assertIsNone(memo.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from blocknode import BlockNode, BlockType, LineIndex, MarkdownError
+
+
+class TestBlockNode(unittest.TestCase):
+    def test_eq(self):
+        node = BlockNode("# Title", BlockType.HEADING, level=1, start=0, end=7)
+        node2 = BlockNode("# Title", BlockType.HEADING, ["# Title"], 1, 0, 7)
+        self.assertEqual(node, node2)
+
+    def test_not_eq(self):
+        node = BlockNode("# Title", BlockType.HEADING, level=1)
+        node2 = BlockNode("# Title", BlockType.PARAGRAPH)
+        self.assertNotEqual(node, node2)
+
+    def test_lines_default(self):
+        node = BlockNode("> one\n> two", BlockType.QUOTE)
+        self.assertEqual(node.lines, ["> one", "> two"])
+
+    def test_lines_given(self):
+        node = BlockNode("> one\n> two", BlockType.QUOTE, ["one", "two"])
+        self.assertEqual(node.lines, ["one", "two"])
+
+    def test_line_index(self):
+        index = LineIndex("one\ntwo\n\nfour")
+        self.assertEqual([index.line_number(offset) for offset in (0, 3, 4, 8, 9, 12)], [1, 1, 2, 3, 4, 4])
+
+    def test_markdown_error(self):
+        error = MarkdownError("Invalid code block", 4)
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(str(error), "Invalid code block")
+        self.assertEqual(str(error.locate("one\ntwo")), "Invalid code block (line 2)")
+
+    def test_markdown_error_without_offset(self):
+        self.assertEqual(str(MarkdownError("Invalid code block", None).locate("text")), "Invalid code block")
+
+    def test_block_type_values(self):
+        self.assertEqual(BlockType.UNORDERED_LIST.value, "unordered_list")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import unittest
+
+from buildlog import BuildLog, QUIET, NORMAL, VERBOSE
+
+
+class TestBuildLog(unittest.TestCase):
+    def log(self, level):
+        self.out = io.StringIO()
+        self.err = io.StringIO()
+        return BuildLog(level, self.out, self.err)
+
+    def emit(self, log):
+        log.info("summary")
+        log.detail("file copied")
+        log.error("failed")
+
+    def test_quiet(self):
+        log = self.log(QUIET)
+        self.emit(log)
+        self.assertFalse(log.normal)
+        self.assertEqual(self.out.getvalue(), "")
+        self.assertEqual(self.err.getvalue(), "failed\n")
+
+    def test_normal(self):
+        log = self.log(NORMAL)
+        self.emit(log)
+        self.assertTrue(log.normal)
+        self.assertFalse(log.verbose)
+        self.assertEqual(self.out.getvalue(), "summary\n")
+
+    def test_verbose(self):
+        log = self.log(VERBOSE)
+        self.emit(log)
+        self.assertEqual(self.out.getvalue(), "summary\nfile copied\n")
+        self.assertEqual(self.err.getvalue(), "failed\n")
+
+    def test_set_level(self):
+        log = self.log(VERBOSE)
+        log.set_level(QUIET)
+        self.assertFalse(log.verbose)
+        log.detail("file copied")
+        self.assertEqual(self.out.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
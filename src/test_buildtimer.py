@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+
+from buildtimer import BuildTimer
+
+
+class TestBuildTimer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_span(self):
+        timer = BuildTimer()
+        with timer.span("read", "a.md"):
+            pass
+        with timer.span("read", "b.md"):
+            pass
+        self.assertEqual(timer.phases["read"][0], 2)
+        self.assertEqual(sorted(timer.pages), ["a.md", "b.md"])
+
+    def test_span_recorded_on_error(self):
+        timer = BuildTimer()
+        with self.assertRaises(ValueError):
+            with timer.span("blocks", "a.md"):
+                raise ValueError("bad markdown")
+        self.assertEqual(timer.phases["blocks"][0], 1)
+
+    def test_slowest_pages(self):
+        timer = BuildTimer()
+        timer.add("read", 0.1, "a.md")
+        timer.add("inline", 0.5, "a.md")
+        timer.add("read", 0.3, "b.md")
+        timer.add("read", 0.2, "c.md")
+        slowest = timer.slowest_pages(2)
+        self.assertEqual([page["page"] for page in slowest], ["a.md", "b.md"])
+        self.assertAlmostEqual(slowest[0]["seconds"], 0.6)
+        self.assertEqual(slowest[0]["phases"], {"read": 0.1, "inline": 0.5})
+
+    def test_merge(self):
+        worker = BuildTimer()
+        worker.add("read", 0.1, "a.md")
+        worker.add("blocks", 0.2, "a.md")
+        timer = BuildTimer()
+        timer.merge(worker.spans(), "a.md")
+        self.assertEqual(timer.pages, worker.pages)
+        self.assertEqual(timer.phase_seconds("blocks"), 0.2)
+        self.assertEqual(timer.phase_seconds("write"), 0.0)
+
+    def test_report_phase_order(self):
+        timer = BuildTimer()
+        timer.add("write", 0.1, "a.md")
+        timer.add("static", 0.1)
+        timer.add("discovery", 0.1)
+        report = timer.report()
+        self.assertEqual(list(report["phases"]), ["discovery", "write", "static"])
+        self.assertEqual(report["pages"], 1)
+        self.assertEqual(report["phases"]["static"], {"count": 1, "seconds": 0.1, "max_seconds": 0.1})
+
+    def test_write_json(self):
+        timer = BuildTimer()
+        timer.add("read", 0.1, "a.md")
+        path = os.path.join(self.tmp.name, "timings.json")
+        timer.write_json(path, slowest=1)
+        with open(path) as f:
+            report = json.load(f)
+        self.assertEqual(report["slowest_pages"][0]["page"], "a.md")
+
+    def test_write_prometheus(self):
+        timer = BuildTimer()
+        timer.add("read", 0.25, "a.md")
+        path = os.path.join(self.tmp.name, "build.prom")
+        timer.write_prometheus(path)
+        with open(path) as f:
+            text = f.read()
+        self.assertIn('ssg_build_phase_seconds{phase="read"} 0.250000\n', text)
+        self.assertIn('ssg_build_phase_spans{phase="read"} 1\n', text)
+        self.assertIn("ssg_build_pages 1\n", text)
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from fingerprint import AssetMap, fingerprint_name, write_headers
+from manifest import hash_file
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "static")
+        self.css = self.write("static/index.css", "body {}")
+        self.write("static/images/logo.png", "png")
+        self.write("static/robots.txt", "User-agent: *")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name(os.path.join("images", "tom.png"), "0123456789abcdef"), os.path.join("images", "tom.0123456789.png"))
+        self.assertEqual(fingerprint_name("LICENSE", "0123456789abcdef"), "LICENSE.0123456789")
+
+    def test_scan(self):
+        assets = AssetMap.scan(self.root)
+        css_hash = hash_file(self.css)[:10]
+        self.assertEqual(sorted(assets.files), [os.path.join("images", "logo.png"), "index.css"]) # robots.txt keeps its name.
+        self.assertEqual(assets.output_name("index.css"), f"index.{css_hash}.css")
+        self.assertIsNone(assets.output_name("robots.txt"))
+
+    def test_scan_reuses_unchanged_hashes(self):
+        previous = AssetMap.scan(self.root).files
+        previous["index.css"] = {**previous["index.css"], "hash": "f" * 64}
+        self.assertEqual(AssetMap.scan(self.root, previous).files["index.css"]["hash"], "f" * 64)
+        self.write("static/index.css", "body { margin: 0 }")
+        self.assertEqual(AssetMap.scan(self.root, previous).files["index.css"]["hash"], hash_file(self.css))
+
+    def test_digest_follows_content(self):
+        digest = AssetMap.scan(self.root).digest
+        self.assertEqual(AssetMap.scan(self.root).digest, digest)
+        self.write("static/index.css", "body { margin: 0 }")
+        self.assertNotEqual(AssetMap.scan(self.root).digest, digest)
+
+    def test_resolve(self):
+        assets = AssetMap.scan(self.root)
+        css_url = "/" + assets.output_name("index.css")
+        self.assertEqual(assets.resolve("/index.css"), css_url)
+        self.assertEqual(assets.resolve("/index.css?v=2#top"), css_url + "?v=2#top")
+        self.assertEqual(assets.resolve("/robots.txt"), "/robots.txt")
+        self.assertEqual(assets.resolve("https://example.com/index.css"), "https://example.com/index.css")
+
+    def test_write_headers(self):
+        assets = AssetMap.scan(self.root)
+        dest = os.path.join(self.tmp.name, "_headers")
+        own_rules = self.write("static/_headers", "/*\n  X-Frame-Options: DENY")
+        self.assertTrue(write_headers(dest, assets, own_rules))
+        with open(dest) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[:2], ["/*", "  X-Frame-Options: DENY"])
+        self.assertIn("/" + assets.output_name("index.css"), lines)
+        self.assertEqual(lines.count("  Cache-Control: public, max-age=31536000, immutable"), 2)
+        self.assertFalse(write_headers(dest, assets, own_rules))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from htmlminify import HtmlMinifier, minify_start_tag, can_omit
+
+
+def minify(*chunks):
+    out = []
+    minifier = HtmlMinifier(out.append)
+    for chunk in chunks:
+        minifier.write(chunk)
+    minifier.close()
+    return "".join(out)
+
+
+class TestHtmlMinifier(unittest.TestCase):
+    def test_collapses_whitespace(self):
+        self.assertEqual(minify("<p>Hello\n   <b>big</b>\tworld </p>"), "<p>Hello <b>big</b> world</p>")
+
+    def test_drops_whitespace_around_blocks(self):
+        html = "<!doctype html>\n<html>\n  <head>\n    <title> T </title>\n  </head>\n  <body>\n    <div> x </div>\n  </body>\n</html>\n"
+        self.assertEqual(minify(html), "<!doctype html><html><head><title>T</title><body><div>x</div>")
+
+    def test_keeps_whitespace_around_form_controls(self):
+        self.assertEqual(minify("<p>Choose <select name=x>\n  <option>a</option>\n</select> now</p>"), "<p>Choose <select name=x> <option>a </select> now</p>")
+        self.assertEqual(minify("<select><option>a</option><option>b</option></select>"), "<select><option>a<option>b</select>")
+
+    def test_unquotes_attributes(self):
+        self.assertEqual(minify_start_tag('<a href="/blog/" title="Two words">', "a"), '<a href=/blog/ title="Two words">')
+        self.assertEqual(minify_start_tag('<img src="/a.png" alt="">', "img"), '<img src=/a.png alt="">')
+        self.assertEqual(minify_start_tag("<p title='say \"hi\"'>", "p"), "<p title='say \"hi\"'>")
+
+    def test_void_elements(self):
+        self.assertEqual(minify('<meta charset="utf-8" />'), "<meta charset=utf-8>")
+        self.assertEqual(minify('<p><img src="/a.png" alt="A"></img>\nText</p>'), "<p><img src=/a.png alt=A> Text</p>")
+        self.assertEqual(minify("a</br>b"), "a</br>b")
+
+    def test_keeps_self_closing_foreign_elements(self):
+        self.assertEqual(minify('<svg><path d="M0 0"/></svg>'), '<svg><path d="M0 0"/></svg>')
+
+    def test_omits_optional_end_tags(self):
+        self.assertEqual(minify("<ul><li>a</li><li>b</li></ul>"), "<ul><li>a<li>b</ul>")
+        self.assertEqual(minify("<div><p>a</p><h2>b</h2><p>c</p></div>"), "<div><p>a<h2>b</h2><p>c</div>")
+        self.assertEqual(minify("<p>a</p><img src=x>"), "<p>a</p><img src=x>")
+        self.assertEqual(minify("<a href=x><p>a</p></a>"), "<a href=x><p>a</p></a>")
+        self.assertEqual(minify("<ul><li>a</li> text</ul>"), "<ul><li>a</li>text</ul>")
+
+    def test_can_omit(self):
+        self.assertTrue(can_omit("html", None, False))
+        self.assertFalse(can_omit("p", None, False))
+        self.assertTrue(can_omit("dd", "dl", True))
+        self.assertFalse(can_omit("dt", "dl", True))
+
+    def test_leaves_pre_alone(self):
+        code = "<pre><code>def f():\n    return  1 < 2\n\n</code></pre>"
+        self.assertEqual(minify("<p>a</p>\n", code, "\n<p>b</p>"), "<p>a" + code + "<p>b</p>")
+
+    def test_leaves_script_and_comments_alone(self):
+        self.assertEqual(minify("<script>if (a  < b) {}</script> <!--  keep  -->"), "<script>if (a  < b) {}</script><!--  keep  -->")
+
+    def test_chunk_boundaries(self):
+        html = '<ul>\n  <li><a href="/x">one</a></li>\n  <li>two  words</li>\n</ul>\n<pre>  x  </pre>'
+        expected = minify(html)
+        for size in range(1, 8):
+            chunks = [html[i:i + size] for i in range(0, len(html), size)]
+            self.assertEqual(minify(*chunks), expected)
+
+    def test_stray_angle_bracket(self):
+        self.assertEqual(minify("<p>1 < 2 and 3 > 2</p>"), "<p>1 < 2 and 3 > 2</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
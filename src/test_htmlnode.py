@@ -1,6 +1,7 @@
 import unittest
 
 from htmlnode import HTMLNode
+from leafnode import LeafNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -45,4 +46,12 @@ class TestHTMLNode(unittest.TestCase):
         "href": "https://www.google.com",
         "target": "_blank",
         } )
-        self.assertNotEqual(node.props_to_html(), node2.props_to_html())
\ No newline at end of file
+        self.assertNotEqual(node.props_to_html(), node2.props_to_html())
+
+    def test_to_html_children(self):
+        node = HTMLNode(tag="div", children=[LeafNode("b", "bold"), LeafNode(None, " text")], props={"id": "main"})
+        self.assertEqual(node.to_html(), '<div id="main"><b>bold</b> text</div>')
+
+    def test_to_html_no_tag(self):
+        node = HTMLNode(children=[LeafNode("b", "bold"), LeafNode(None, " text")])
+        self.assertEqual(node.to_html(), "<b>bold</b> text")
@@ -28,4 +28,14 @@ class TestLeafNode(unittest.TestCase):
 
     def test_missing_props(self):
         node = LeafNode(tag=None, value="Just plain text", props=None)
-        self.assertEqual(node.to_html(), "Just plain text")
\ No newline at end of file
+        self.assertEqual(node.to_html(), "Just plain text")
+
+    def test_no_children(self):
+        node = LeafNode(tag="b", value="Bold")
+        self.assertEqual(node.children, ())
+        with self.assertRaises(AttributeError):
+            node.children = [LeafNode(None, "text")]
+
+    def test_slots(self):
+        node = LeafNode(tag="b", value="Bold")
+        self.assertFalse(hasattr(node, "__dict__"))
@@ -1,4 +1,8 @@
+import gzip
+import os
+import tempfile
 import unittest
+import main
 from main import text_node_to_html_node, \
     split_nodes_delimiter, \
     extract_markdown_images, \
@@ -9,11 +13,32 @@ from main import text_node_to_html_node, \
     markdown_to_blocks, \
     block_to_block_type, \
     markdown_to_html_node, \
-    extract_title
+    extract_title, \
+    parse_blocks, \
+    blocks_to_html_node, \
+    traced, \
+    precompressing, \
+    find_pages, \
+    generate_page, \
+    open_page, \
+    generate_pages_parallel, \
+    generate_pages_pipelined, \
+    build_site, \
+    watch_site, \
+    parse_args
 from textnode import TextNode, TextType
+from blocknode import BlockNode, BlockType, MarkdownError
 from parentnode import ParentNode
 from leafnode import LeafNode
 from htmlnode import HTMLNode
+from buildtimer import BuildTimer
+from rendercache import RenderCache
+from blockmemo import BlockMemo
+from precompress import Precompressor
+from fingerprint import AssetMap
+from pagetemplate import PageTemplate
+from manifest import BuildManifest
+from buildlog import log, QUIET
 
 class TestMain(unittest.TestCase):
     def test_text_node_to_html_node_normal(self):
@@ -46,6 +71,22 @@ class TestMain(unittest.TestCase):
         expected = LeafNode("img", "", props={"src": "https://www.google.com", "alt": "alt text"})
         self.assertEqual(text_node_to_html_node(node), expected)
 
+    def test_text_node_to_html_node_link_basepath(self):
+        node = TextNode("Home", TextType.LINK, "/blog/tom")
+        expected = LeafNode("a", "Home", props={"href": "/site/blog/tom"})
+        self.assertEqual(text_node_to_html_node(node, "/site/"), expected)
+
+    def test_text_node_to_html_node_image_basepath(self):
+        node = TextNode("alt text", TextType.IMAGE, "/images/tom.png")
+        expected = LeafNode("img", "", props={"src": "/site/images/tom.png", "alt": "alt text"})
+        self.assertEqual(text_node_to_html_node(node, "/site/"), expected)
+
+    def test_text_node_to_html_node_image_fingerprinted(self):
+        node = TextNode("alt text", TextType.IMAGE, "/images/tom.png")
+        assets = AssetMap("static", {os.path.join("images", "tom.png"): {"hash": "0123456789abcdef", "size": 3, "mtime_ns": 0}})
+        expected = LeafNode("img", "", props={"src": "/site/images/tom.0123456789.png", "alt": "alt text"})
+        self.assertEqual(text_node_to_html_node(node, "/site/", assets), expected)
+
     def test_text_node_to_html_node_invalid(self):
         node = TextNode("Hello World", None)
         with self.assertRaises(Exception) as context:
@@ -263,6 +304,32 @@ class TestMain(unittest.TestCase):
         ]
         self.assertEqual(text_to_textnodes(text), expected)
 
+    def test_text_to_textnodes_matches_split_chain(self):
+        texts = [
+            "",
+            "plain text",
+            "**bold _italic_ bold** and `code`",
+            "snake_case_name and `unclosed",
+            "![image](/a.png)[link](/b) tail",
+            "![same](/x)[same](/x)",
+            "`x`x",
+        ]
+        for text in texts:
+            nodes = split_nodes_link([TextNode(text, TextType.NORMAL)])
+            expected = split_nodes_delimiter(split_nodes_image(nodes))
+            self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_link_and_image(self):
+        text = "An ![image](/a.png) and a [link](/b)."
+        expected = [
+            TextNode("An ", TextType.NORMAL),
+            TextNode("image", TextType.IMAGE, "/a.png"),
+            TextNode(" and a ", TextType.NORMAL),
+            TextNode("link", TextType.LINK, "/b"),
+            TextNode(".", TextType.NORMAL),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
     def test_markdown_to_blocks(self):
         text = "\n\n# Heading\n\nText\n\n* Item\n\n"
         expected = ["# Heading", "Text", "* Item"]
@@ -283,6 +350,145 @@ class TestMain(unittest.TestCase):
         expected = ["* First item\n\n* Second item", "* New list"]
         self.assertEqual(markdown_to_blocks(text), expected)
 
+    def test_markdown_to_blocks_trailing_marker(self):
+        text = "- item\n- "
+        expected = ["- item", "-"]
+        self.assertEqual(markdown_to_blocks(text), expected)
+
+    def test_markdown_to_blocks_many_blocks(self):
+        text = "# Title\n\n" + "> quote\n\nParagraph\n\n" * 5000 # Deeper than the default recursion limit.
+        blocks = markdown_to_blocks(text)
+        self.assertEqual(len(blocks), 10001)
+        self.assertEqual(blocks[-2:], ["> quote", "Paragraph"])
+
+    def test_markdown_to_blocks_unclosed_code(self):
+        with self.assertRaises(ValueError):
+            markdown_to_blocks("Text\n\n```python\nprint('hi')")
+
+    def test_parse_blocks(self):
+        text = "## Heading\n\n* one\n* two  \n\nText"
+        expected = [
+            BlockNode("## Heading", BlockType.HEADING, ["## Heading"], 2, 0, 10),
+            BlockNode("* one\n* two", BlockType.UNORDERED_LIST, ["* one", "* two"], 0, 12, 25),
+            BlockNode("Text", BlockType.PARAGRAPH, ["Text"], 0, 27, 31),
+        ]
+        self.assertEqual(list(parse_blocks(text)), expected)
+
+    def test_parse_blocks_offsets(self):
+        text = "\n\n> quote\n> more\n\n```\ncode\n```\n"
+        blocks = list(parse_blocks(text))
+        self.assertEqual([block.block_type for block in blocks], [BlockType.QUOTE, BlockType.CODE])
+        self.assertEqual([text[block.start:block.end] for block in blocks], ["> quote\n> more", "```\ncode\n```"])
+
+    def test_blocks_to_html_node_memo(self):
+        memo = BlockMemo()
+        markdown = "# Title\n\nShared **note** with [a link](/x)\n\n* one\n* two"
+        expected = markdown_to_html_node(markdown, "/base/").to_html()
+        self.assertEqual(blocks_to_html_node(parse_blocks(markdown), "/base/", memo).to_html(), expected)
+        self.assertEqual(blocks_to_html_node(parse_blocks(markdown), "/base/", memo).to_html(), expected)
+        self.assertEqual((memo.hits, memo.misses), (3, 3))
+        blocks_to_html_node(parse_blocks(markdown), "/other/", memo) # Rendered links depend on the basepath.
+        self.assertEqual(memo.misses, 6)
+
+    def test_blocks_to_html_node_memo_skips_large_blocks(self):
+        memo = BlockMemo(max_bytes=64 * 100)
+        markdown = "# Small\n\n" + "word " * 40
+        expected = markdown_to_html_node(markdown).to_html()
+        for _ in range(2):
+            self.assertEqual(blocks_to_html_node(parse_blocks(markdown), "/", memo).to_html(), expected)
+        self.assertEqual((len(memo), memo.hits, memo.misses), (1, 1, 1)) # The large paragraph is neither looked up nor kept.
+        self.assertLessEqual(memo.size, memo.max_bytes)
+
+    def test_scan_mapped_blocks(self):
+        markdown = "# Title é\n\nText\nmore\n\n- a\n- \n\n```\ncode\n```\n\n> quote\n\n1. one\n2. two\n\nEnd"
+        expected = list(parse_blocks(markdown))
+        for window in (1, 4, 16, 1024):
+            mapped = [main.span_to_block(text, base, form, start, end, level) for text, base, form, start, end, level in main.scan_mapped_blocks(markdown.encode(), window)]
+            self.assertEqual(mapped, expected)
+        self.assertEqual(list(parse_blocks(markdown.encode())), expected)
+
+    def test_heading_text_follows_marker(self):
+        for markdown, expected in (("#x > ", "<div><h2>></h2></div>"), ("#tag foo", "<div><h4>foo</h4></div>"), ("## #hash", "<div><h2>#hash</h2></div>")):
+            self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+            block = next(parse_blocks(markdown))
+            self.assertEqual(f"<div><h{block.level}>{block.text[block.level:].strip()}</h{block.level}></div>", expected) # Agrees with BlockNode.text.
+
+    def test_blocks_are_spans(self):
+        markdown = "#  Title \n\nText  \n more\n\n* a\n* b  \n\n\n```\ncode\n```\n"
+        self.assertEqual([(form.value, markdown[start:end]) for form, start, end, _ in main.scan_blocks(markdown)], [
+            ("heading", "#  Title "),
+            ("paragraph", "Text  \n more"),
+            ("unordered_list", "* a\n* b  "),
+            ("code", "```\ncode\n```"),
+        ])
+        blocks = list(parse_blocks(markdown))
+        self.assertEqual([block._text is None for block in blocks], [True, True, False, True]) # Only a list is sliced early, to check it really is one.
+        self.assertTrue(all(block.source is markdown for block in blocks))
+        self.assertEqual([block.text for block in blocks], ["# Title", "Text\nmore", "* a\n* b", "```\ncode\n```"])
+        self.assertEqual(markdown_to_html_node("* \n> quote").to_html(), "<div><p>*</p><blockquote>quote</blockquote></div>") # A lone marker is a paragraph.
+
+    def test_scan_mapped_blocks_error(self):
+        with self.assertRaises(ValueError):
+            list(main.scan_mapped_blocks(b"Text\n\nMore\n\n```\nunclosed", 4))
+
+    def test_markdown_error_line(self):
+        with self.assertRaises(MarkdownError) as context:
+            markdown_to_html_node("# Title\n\nText\n\n```\nunclosed")
+        self.assertEqual(context.exception.line, 5)
+        with self.assertRaisesRegex(ValueError, r"Unable to process remaining markdown, stalled at '2\. Two\.\.\.' \(line 3\)"):
+            markdown_to_html_node("Text\n\n2. Two")
+
+    def test_mapped_line_number(self):
+        markdown = "é\n" * 50 + "x"
+        self.addCleanup(setattr, main, "STREAM_WINDOW", main.STREAM_WINDOW)
+        main.STREAM_WINDOW = 8
+        self.assertEqual(main.mapped_line_number(markdown.encode(), len(markdown) - 1), 51)
+        self.assertEqual(main.mapped_line_number(markdown.encode(), 0), 1)
+
+    def test_scan_mapped_blocks_error_offset(self):
+        markdown = "Text\n\nMore\n\nEven more\n\n```\nunclosed"
+        with self.assertRaises(MarkdownError) as context:
+            list(main.scan_mapped_blocks(markdown.encode(), 4))
+        self.assertEqual(context.exception.offset, markdown.index("```"))
+
+    def test_code_block_sliced(self):
+        self.assertEqual(markdown_to_html_node("```py\na\n\nb\n```").to_html(), "<div><pre><code>a\n\nb</code></pre></div>")
+        self.assertEqual(markdown_to_html_node("```\na\nb ```").to_html(), "<div><pre><code>a\nb ```</code></pre></div>")
+
+    def test_extract_mapped_title(self):
+        self.assertEqual(main.extract_mapped_title(b"\n  # Title \nText"), "Title")
+        self.assertEqual(main.extract_mapped_title(b"Intro\n# H1 \xc3\xa9\n"), "H1 \u00e9")
+        with self.assertRaisesRegex(ValueError, "No h1 header found"):
+            main.extract_mapped_title(b"Text\n  # Indented")
+        with self.assertRaisesRegex(ValueError, "Empty input string"):
+            main.extract_mapped_title(b" \n\n")
+
+    def test_traced(self):
+        with traced() as events:
+            markdown_to_html_node("# Title\n\n* **a**\n* b")
+        self.assertEqual(events, [
+            ("split", "heading", 0, 7),
+            ("classify", "heading", 0, 7),
+            ("inline", "Title", [("Normal text", "Title")]),
+            ("split", "unordered_list", 9, 20),
+            ("classify", "unordered_list", 9, 20),
+            ("inline", "**a**", [("Bold text", "a")]),
+            ("inline", "b", [("Normal text", "b")]),
+        ])
+
+    def test_traced_stall(self):
+        with traced() as events:
+            with self.assertRaises(ValueError):
+                list(parse_blocks("Text\n\n2. Two"))
+        self.assertEqual(events[-1], ("stall", "2. Two", 6, 12))
+
+    def test_trace_off_by_default(self):
+        events = []
+        with traced(events):
+            pass
+        markdown_to_html_node("Text")
+        self.assertEqual(events, [])
+
     def test_block_to_block_type_empty_lines(self):
         text = "1. First\n\n2. Second\n\n3. Third"
         expected = "ordered_list"
@@ -608,3 +814,265 @@ Last paragraph with **bold italic** text."""
     
         expected = "Main Title"
         assert extract_title(markdown) == expected
+
+
+class TestPageGeneration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.template = self.write("template.html", '<title>{{ Title }}</title><a href="/">{{ Content }}</a>')
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/blog/b/index.md", "# B")
+        self.write("content/blog/a/index.md", "# A")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, name):
+        with open(os.path.join(self.tmp.name, name)) as f:
+            return f.read()
+
+    def test_find_pages_sorted(self):
+        pages = find_pages(self.content, self.dest)
+        expected = [
+            (os.path.join(self.content, "index.md"), os.path.join(self.dest, "index.html")),
+            (os.path.join(self.content, "blog", "a", "index.md"), os.path.join(self.dest, "blog", "a", "index.html")),
+            (os.path.join(self.content, "blog", "b", "index.md"), os.path.join(self.dest, "blog", "b", "index.html")),
+        ]
+        self.assertEqual(pages, expected)
+
+    def test_find_pages_invalid_path(self):
+        with self.assertRaises(Exception):
+            find_pages(os.path.join(self.tmp.name, "missing"), self.dest)
+
+    def test_generate_pages_parallel(self):
+        errors = generate_pages_parallel(self.content, self.template, self.dest, "/base/", 2)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.read("docs/index.html"), '<title>Home</title><a href="/base/"><div><h1>Home</h1><p>Welcome</p></div></a>')
+        self.assertEqual(self.read("docs/blog/a/index.html"), '<title>A</title><a href="/base/"><div><h1>A</h1></div></a>')
+
+    def test_render_page_job_takes_only_a_path(self):
+        for name in ("WORKER_TEMPLATE", "WORKER_CACHE", "WORKER_MEMO"):
+            self.addCleanup(setattr, main, name, getattr(main, name))
+        main.init_worker(main.open_template(self.template, "/base/"), None, 0, 0) # Sent to each worker once, not with every page.
+        html, error, _, _ = main.render_page_job(os.path.join(self.content, "blog", "a", "index.md"))
+        self.assertIsNone(error)
+        self.assertEqual(html, '<title>A</title><a href="/base/"><div><h1>A</h1></div></a>')
+
+    def test_generate_pages_parallel_collects_errors(self):
+        self.write("content/broken/index.md", "No title here")
+        errors = generate_pages_parallel(self.content, self.template, self.dest, "/", 2)
+        self.assertEqual(errors, [(os.path.join(self.content, "broken", "index.md"), "ValueError: No h1 header found")])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "broken", "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "blog", "b", "index.html")))
+
+    def test_page_errors_match_across_modes(self):
+        self.write("content/broken/index.md", "# Broken\n\n2. Two")
+        printed = []
+        self.addCleanup(setattr, log, "err", log.err)
+        log.err = type("Sink", (), {"write": lambda self, text: printed.append(text)})()
+        source = os.path.join(self.content, "broken", "index.md")
+        expected = [(source, "MarkdownError: Unable to process remaining markdown, stalled at '2. Two...' (line 3)")]
+        self.assertEqual(generate_pages_parallel(self.content, self.template, self.dest, "/", 2), expected)
+        self.assertEqual(generate_pages_pipelined(self.content, self.template, self.dest, "/"), expected)
+        self.assertEqual(printed, []) # Gathered per page, not printed by the parser.
+        main.generate_pages_recursive(self.content, self.template, self.dest, "/")
+        self.assertEqual(printed, [f"Could not generate page from {source}: {expected[0][1]}\n"])
+
+    def test_generate_pages_parallel_timings(self):
+        timer = BuildTimer()
+        generate_pages_parallel(self.content, self.template, self.dest, "/", 2, timer=timer)
+        self.assertEqual(len(timer.pages), 3)
+        for phase in ("discovery", "read", "blocks", "inline", "render", "template", "write"):
+            self.assertIn(phase, timer.phases)
+
+    def test_page_phases_match_across_modes(self):
+        expected = {"read", "blocks", "inline", "render", "template", "write"}
+        for generate in (main.generate_pages_recursive, generate_pages_pipelined, lambda *args, timer: generate_pages_parallel(*args, 2, timer=timer)):
+            timer = BuildTimer()
+            generate(self.content, self.template, self.dest, "/", timer=timer)
+            self.assertEqual([set(phases) for phases in timer.pages.values()], [expected] * 3)
+            self.assertEqual(timer.phases["inline"][0], 3) # One inline span per page.
+
+    def test_generate_pages_pipelined(self):
+        self.write("content/broken/index.md", "No title here")
+        errors = generate_pages_pipelined(self.content, self.template, self.dest, "/base/", readers=2, writers=2, in_flight=1)
+        self.assertEqual(errors, [(os.path.join(self.content, "broken", "index.md"), "ValueError: No h1 header found")])
+        self.assertEqual(self.read("docs/index.html"), '<title>Home</title><a href="/base/"><div><h1>Home</h1><p>Welcome</p></div></a>')
+        self.assertEqual(self.read("docs/blog/a/index.html"), '<title>A</title><a href="/base/"><div><h1>A</h1></div></a>')
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "broken", "index.html")))
+
+    def test_generate_streamed_page(self):
+        self.write("content/index.md", "# Home\n\nWelcome [home](/)\n\n* one\n* two\n\n```\ncode\n```")
+        source = os.path.join(self.content, "index.md")
+        dest = os.path.join(self.dest, "index.html")
+        generate_page(source, self.template, dest, "/base/")
+        expected = self.read("docs/index.html")
+        os.remove(dest)
+        self.addCleanup(setattr, main, "STREAM_THRESHOLD", main.STREAM_THRESHOLD)
+        main.STREAM_THRESHOLD = 0
+        generate_page(source, self.template, dest, "/base/")
+        self.assertEqual(self.read("docs/index.html"), expected)
+
+    def test_generate_page(self):
+        dest = os.path.join(self.dest, "index.html")
+        generate_page(os.path.join(self.content, "index.md"), self.template, dest, "/base/")
+        self.assertEqual(self.read("docs/index.html"), '<title>Home</title><a href="/base/"><div><h1>Home</h1><p>Welcome</p></div></a>')
+
+    def test_generate_page_streams_through_template(self):
+        template = PageTemplate.from_file(self.template, "/base/")
+        template.fill = None # Never materializes the page.
+        timer = BuildTimer()
+        dest = os.path.join(self.dest, "index.html")
+        generate_page(os.path.join(self.content, "index.md"), self.template, dest, "/base/", template, timer)
+        self.assertEqual(self.read("docs/index.html"), '<title>Home</title><a href="/base/"><div><h1>Home</h1><p>Welcome</p></div></a>')
+        self.assertEqual(set(timer.pages[os.path.join(self.content, "index.md")]), {"read", "blocks", "inline", "render", "template", "write"})
+
+    def test_generate_page_from_cache(self):
+        source = os.path.join(self.content, "index.md")
+        dest = os.path.join(self.dest, "index.html")
+        cache = RenderCache(os.path.join(self.tmp.name, "cache"), 1 << 20)
+        timer = BuildTimer()
+        generate_page(source, self.template, dest, "/base/", timer=timer, cache=cache)
+        first = self.read("docs/index.html")
+        generate_page(source, self.template, dest, "/base/", timer=timer, cache=cache)
+        self.assertEqual(self.read("docs/index.html"), first)
+        self.assertEqual(timer.counters, {"cache_misses": 1, "cache_hits": 1, "writes_skipped": 1})
+
+    def test_generate_page_skips_identical_write(self):
+        source = os.path.join(self.content, "index.md")
+        dest = os.path.join(self.dest, "index.html")
+        timer = BuildTimer()
+        generate_page(source, self.template, dest, "/base/", timer=timer)
+        os.utime(dest, ns=(1, 1))
+        generate_page(source, self.template, dest, "/base/", timer=timer)
+        self.assertEqual(os.stat(dest).st_mtime_ns, 1)
+        self.assertEqual(timer.counters, {"writes_skipped": 1})
+        self.write("content/index.md", "# Home\n\nChanged")
+        generate_page(source, self.template, dest, "/base/", timer=timer)
+        self.assertNotEqual(os.stat(dest).st_mtime_ns, 1)
+        self.assertEqual(timer.counters, {"writes_skipped": 1})
+
+    def test_pipelined_and_streamed_skip_identical_writes(self):
+        generate_pages_pipelined(self.content, self.template, self.dest, "/")
+        timer = BuildTimer()
+        generate_pages_pipelined(self.content, self.template, self.dest, "/", timer=timer)
+        self.assertEqual(timer.counters["writes_skipped"], 3)
+        self.addCleanup(setattr, main, "STREAM_THRESHOLD", main.STREAM_THRESHOLD)
+        main.STREAM_THRESHOLD = 0
+        timer = BuildTimer()
+        generate_pages_parallel(self.content, self.template, self.dest, "/", 2, timer=timer)
+        self.assertEqual(timer.counters["writes_skipped"], 3)
+
+    def test_open_page_unchanged(self):
+        dest = os.path.join(self.dest, "index.html")
+        with open_page(dest) as f:
+            f.write("<html>")
+        self.assertFalse(f.unchanged)
+        with open_page(dest) as f:
+            f.writelines(["<ht", "ml>"])
+        self.assertTrue(f.unchanged)
+        self.assertEqual(os.listdir(self.dest), ["index.html"])
+
+    def test_open_page_precompressing(self):
+        dest = os.path.join(self.dest, "index.html")
+        precompressor = Precompressor(workers=1)
+        with precompressing(precompressor):
+            with open_page(dest) as f:
+                f.write("<p>Hello</p>" * 100)
+        self.assertIsNone(main.PRECOMPRESS)
+        precompressor.close()
+        with open(dest + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), b"<p>Hello</p>" * 100)
+
+    def test_open_page_failure_leaves_no_file(self):
+        dest = os.path.join(self.dest, "broken", "index.html")
+        with self.assertRaises(ValueError):
+            with open_page(dest) as f:
+                f.write("<html>")
+                raise ValueError("Render failed")
+        self.assertEqual(os.listdir(os.path.dirname(dest)), [])
+
+
+class TestWatchSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name) # The build reads content/, static/ and template.html from the working directory.
+        self.addCleanup(log.set_level, log.level)
+        log.set_level(QUIET)
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("content/index.md", "# Home")
+        os.makedirs("static")
+        self.args = parse_args(["--no-cache", "--interval", "0"])
+        self.manifest = BuildManifest(".build-manifest.json", "template.html", "/")
+        build_site(self.args, self.manifest)
+
+    def write(self, name, text):
+        os.makedirs(os.path.dirname(name) or ".", exist_ok=True)
+        with open(name, "w") as f:
+            f.write(text)
+
+    def read(self, name):
+        with open(name) as f:
+            return f.read()
+
+    def watch(self, *steps): # Runs each step in place of one sleep between polls, then stops the watcher.
+        steps = list(steps)
+        def sleep(seconds):
+            if not steps:
+                raise KeyboardInterrupt
+            steps.pop(0)()
+        self.addCleanup(setattr, main.time, "sleep", main.time.sleep)
+        main.time.sleep = sleep
+        watch_site(self.args, self.manifest)
+
+    def test_survives_template_moved_away(self):
+        self.watch(
+            lambda: os.rename("template.html", "template.html.swp"),
+            lambda: self.write("content/index.md", "# Home, edited"),
+            lambda: os.rename("template.html.swp", "template.html"),
+            lambda: self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}"),
+        )
+        self.assertEqual(self.read("docs/index.html"), "<h1>Home, edited</h1><div><h1>Home, edited</h1></div>")
+
+    def test_survives_failed_batch(self):
+        rebuild_changes = main.rebuild_changes
+        def fail_once(*args):
+            main.rebuild_changes = rebuild_changes
+            raise OSError("disk full")
+        self.addCleanup(setattr, main, "rebuild_changes", rebuild_changes)
+        main.rebuild_changes = fail_once
+        errors = []
+        self.addCleanup(setattr, log, "err", log.err)
+        log.err = type("Sink", (), {"write": lambda self, text: errors.append(text)})()
+        self.watch(
+            lambda: self.write("content/index.md", "# One"),
+            lambda: self.write("content/index.md", "# Two"),
+        )
+        self.assertEqual(errors, ["Rebuild failed: OSError: disk full\n"])
+        self.assertEqual(self.read("docs/index.html"), "<title>Two</title><div><h1>Two</h1></div>")
+
+    def test_memo_lives_across_batches(self):
+        memos = []
+        rebuild_changes = main.rebuild_changes
+        def record(changed, removed, template, manifest, args, memo=None):
+            memos.append(memo)
+            rebuild_changes(changed, removed, template, manifest, args, memo)
+        self.addCleanup(setattr, main, "rebuild_changes", rebuild_changes)
+        main.rebuild_changes = record
+        self.write("content/index.md", "# Home\n\nShared")
+        self.watch(
+            lambda: self.write("content/index.md", "# One\n\nShared"),
+            lambda: self.write("content/index.md", "# Two\n\nShared"),
+        )
+        self.assertEqual(len(memos), 2)
+        self.assertIs(memos[0], memos[1])
+        self.assertEqual(memos[0].hits, 1) # The unchanged paragraph is rendered once for both edits.
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest, hash_file
+from fingerprint import AssetMap
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.template = self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.source = self.write("index.md", "# Title")
+        self.dest = self.write("index.html", "<h1>Title</h1>")
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def build(self, basepath="/"):
+        manifest = BuildManifest(self.manifest_path, self.template, basepath)
+        if manifest.needs_build(self.source, self.dest):
+            manifest.mark_built(self.source)
+        manifest.save()
+        return manifest
+
+    def test_hash_file(self):
+        other = self.write("copy.md", "# Title")
+        self.assertEqual(hash_file(self.source), hash_file(other))
+
+    def test_first_build_is_invalid(self):
+        manifest = self.build()
+        self.assertFalse(manifest.is_valid)
+        self.assertEqual(manifest.built, 1)
+
+    def test_noop_rebuild_skips(self):
+        self.build()
+        manifest = self.build()
+        self.assertTrue(manifest.is_valid)
+        self.assertEqual(manifest.skipped, 1)
+        self.assertEqual(manifest.built, 0)
+
+    def test_changed_source_rebuilds(self):
+        self.build()
+        self.write("index.md", "# Other title")
+        manifest = self.build()
+        self.assertEqual(manifest.built, 1)
+
+    def test_missing_output_rebuilds(self):
+        self.build()
+        os.remove(self.dest)
+        manifest = self.build()
+        self.assertEqual(manifest.built, 1)
+
+    def test_template_change_invalidates(self):
+        self.build()
+        self.write("template.html", "{{ Content }}")
+        manifest = self.build()
+        self.assertFalse(manifest.is_valid)
+        self.assertEqual(manifest.built, 1)
+
+    def test_basepath_change_invalidates(self):
+        self.build()
+        manifest = self.build(basepath="/static-site-generator/")
+        self.assertFalse(manifest.is_valid)
+        self.assertEqual(manifest.built, 1)
+
+    def test_asset_change_invalidates(self):
+        assets = AssetMap("static", {"index.css": {"hash": "a" * 64, "size": 7, "mtime_ns": 0}})
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        manifest.use_assets(assets)
+        manifest.save()
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        self.assertEqual(manifest.previous_assets, assets.files)
+        manifest.use_assets(assets)
+        self.assertTrue(manifest.is_valid)
+        manifest.use_assets(AssetMap("static", {"index.css": {"hash": "b" * 64, "size": 7, "mtime_ns": 0}}))
+        self.assertFalse(manifest.is_valid)
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        manifest.use_assets(None) # Pages still point at fingerprinted names.
+        self.assertFalse(manifest.is_valid)
+
+    def test_minify_change_invalidates(self):
+        self.build()
+        manifest = BuildManifest(self.manifest_path, self.template, "/", minify=True)
+        self.assertFalse(manifest.is_valid)
+        manifest.save()
+        self.assertTrue(BuildManifest(self.manifest_path, self.template, "/", minify=True).is_valid)
+        self.assertFalse(BuildManifest(self.manifest_path, self.template, "/").is_valid)
+
+    def test_remove_stale_outputs_after_invalidation(self):
+        self.build()
+        os.remove(self.source)
+        manifest = BuildManifest(self.manifest_path, self.template, "/other/")
+        self.assertFalse(manifest.is_valid)
+        self.assertEqual(manifest.remove_stale_outputs(), [self.dest])
+
+    def test_static_files_recorded(self):
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        self.assertFalse(manifest.exists)
+        manifest.static = ["index.css"]
+        manifest.save()
+        manifest = BuildManifest(self.manifest_path, self.template, "/other/")
+        self.assertTrue(manifest.exists)
+        self.assertEqual(manifest.previous_static, ["index.css"])
+
+    def test_remove_stale_outputs(self):
+        self.build()
+        os.remove(self.source)
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        self.assertEqual(manifest.remove_stale_outputs(), [self.dest])
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_relocate(self):
+        self.build()
+        manifest = BuildManifest(self.manifest_path, self.template, "/")
+        staging = os.path.join(self.tmp.name, "staging")
+        manifest.relocate(self.tmp.name, staging)
+        self.assertEqual(manifest.previous[self.source]["dest"], os.path.join(staging, "index.html"))
+        manifest.relocate(staging, self.tmp.name)
+        self.assertEqual(manifest.previous[self.source]["dest"], self.dest)
+        self.assertIs(manifest.previous, manifest.recorded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import os
+import unittest
+
+from pagetemplate import PageTemplate, rewrite_url
+from parentnode import ParentNode
+from leafnode import LeafNode
+from fingerprint import AssetMap
+
+
+class TestPageTemplate(unittest.TestCase):
+    def test_render(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.render("Hello", "<p>World</p>"), "<title>Hello</title><body><p>World</p></body>")
+
+    def test_slots(self):
+        template = PageTemplate("{{ Content }}<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(template.slots, ["Content", "Title", "Content"])
+        self.assertEqual(template.render("T", "C"), "C<h1>T</h1>C")
+
+    def test_no_slots(self):
+        template = PageTemplate("<p>static</p>")
+        self.assertEqual(template.render("T", "C"), "<p>static</p>")
+
+    def test_basepath_rewritten_in_template(self):
+        template = PageTemplate('<link href="/index.css"><img src="/logo.png">{{ Content }}', "/blog/")
+        self.assertEqual(template.render("T", "C"), '<link href="/blog/index.css"><img src="/blog/logo.png">C')
+
+    def test_assets_fingerprinted_in_template(self):
+        assets = AssetMap("static", {"index.css": {"hash": "0123456789abcdef", "size": 7, "mtime_ns": 0}})
+        template = PageTemplate('<link href="/index.css"><img src="/logo.png">{{ Content }}', "/blog/", assets=assets)
+        self.assertEqual(template.render("T", "C"), '<link href="/blog/index.0123456789.css"><img src="/blog/logo.png">C')
+
+    def test_content_not_rescanned(self):
+        template = PageTemplate("{{ Content }}", "/blog/")
+        self.assertEqual(template.render("T", '<a href="/x">{{ Title }}</a>'), '<a href="/x">{{ Title }}</a>')
+
+    def test_write(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        out = io.StringIO()
+        content_seconds, template_seconds = template.write(out, "Hello", ParentNode("p", [LeafNode(None, "World")]))
+        self.assertEqual(out.getvalue(), "<title>Hello</title><body><p>World</p></body>")
+        self.assertGreater(content_seconds, 0)
+        self.assertGreater(template_seconds, 0)
+
+    def test_write_leaves_out_writer_time(self):
+        class SlowWriter (): # Claims a second of its own for every write.
+            def __init__(self):
+                self.seconds = 0.0
+            def write(self, text):
+                self.seconds += 1.0
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        content_seconds, template_seconds = template.write(SlowWriter(), "Hello", ParentNode("p", [LeafNode(None, "World")]))
+        self.assertLess(content_seconds, 1.0)
+        self.assertLess(template_seconds, 1.0)
+
+    def test_fill(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.fill("Hello", ["<p>", "World", "</p>"]), ["<title>", "Hello", "</title><body>", "<p>", "World", "</p>", "</body>"])
+
+    def test_fill_minified(self):
+        template = PageTemplate("<title> {{ Title }} </title>\n<body>\n  {{ Content }}\n</body>", minify=True)
+        chunks = ["<ul>", "<li>", "one", "</li>", "<li>", "two", "</li>", "</ul>", "<pre><code>  x\n  y</code></pre>"]
+        self.assertEqual("".join(template.fill("Hello", chunks)), "<title>Hello</title><body><ul><li>one<li>two</ul><pre><code>  x\n  y</code></pre>")
+
+    def test_write_minified(self):
+        template = PageTemplate("<body>\n  {{ Content }}\n</body>", minify=True)
+        out = io.StringIO()
+        template.write(out, "Hello", ParentNode("p", [LeafNode(None, "World  wide")]))
+        self.assertEqual(out.getvalue(), "<body><p>World wide")
+
+    def test_rewrite_url(self):
+        self.assertEqual(rewrite_url("/images/tom.png", "/blog/"), "/blog/images/tom.png")
+        self.assertEqual(rewrite_url("https://boot.dev", "/blog/"), "https://boot.dev")
+        self.assertEqual(rewrite_url("/images/tom.png", None), "/images/tom.png")
+        assets = AssetMap("static", {os.path.join("images", "tom.png"): {"hash": "0123456789abcdef", "size": 3, "mtime_ns": 0}})
+        self.assertEqual(rewrite_url("/images/tom.png", "/blog/", assets), "/blog/images/tom.0123456789.png")
+        self.assertEqual(rewrite_url("/blog/tom", "/blog/", assets), "/blog/blog/tom")
+
+
+if __name__ == "__main__":
+    unittest.main()
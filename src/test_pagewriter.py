@@ -0,0 +1,32 @@
+import hashlib
+import io
+import unittest
+
+from pagewriter import PageWriter, BATCH_SIZE
+
+
+class TestPageWriter(unittest.TestCase):
+    def test_batches_small_chunks(self):
+        f = io.BytesIO()
+        writer = PageWriter(f)
+        writer.writelines(["<p>", "é", "</p>"])
+        self.assertEqual(f.getvalue(), b"") # Still buffered.
+        writer.flush()
+        self.assertEqual(f.getvalue(), "<p>é</p>".encode())
+        self.assertEqual(writer.size, len("<p>é</p>".encode()))
+        self.assertEqual(writer.digest.hexdigest(), hashlib.sha256("<p>é</p>".encode()).hexdigest())
+
+    def test_buffer_is_bounded(self):
+        f = io.BytesIO()
+        writer = PageWriter(f, keep=True)
+        chunk = "x" * 1000
+        for _ in range(3 * BATCH_SIZE // len(chunk)):
+            writer.write(chunk)
+            self.assertLess(writer.pending_size, BATCH_SIZE)
+        writer.flush()
+        self.assertEqual(len(f.getvalue()), 3 * BATCH_SIZE // len(chunk) * len(chunk))
+        self.assertEqual(writer.data(), f.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode
@@ -94,4 +95,31 @@ class TestParentNode(unittest.TestCase):
 
         expected = "ParentNode(tag='p', children=[LeafNode(tag='b', value='Bold text'), LeafNode(tag=None, value='Normal text'), ParentNode(tag='p', children=[LeafNode(tag='b', value='Bold text', props={'href': 'https://www.google.com', 'target': '_blank'}), LeafNode(tag=None, value='Normal text')]), LeafNode(tag='i', value='italic text'), LeafNode(tag=None, value='Normal text')], props={'href': 'https://www.google.com', 'target': '_blank'})"
         
-        self.assertEqual(repr(node), expected)
\ No newline at end of file
+        self.assertEqual(repr(node), expected)
+
+    def test_iter_html(self):
+        node = ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")], props={"class": "x"})
+        self.assertEqual(list(node.iter_html()), ['<p class="x">', "<b>Bold</b>", " text", "</p>"])
+
+    def test_write_html_list(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "text")])])
+        chunks = []
+        node.write_html(chunks)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_write_html_file(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "text")])])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), "<div><p>text</p></div>")
+
+    def test_deep_tree(self):
+        node = LeafNode(None, "text")
+        for _ in range(5000): # Deeper than the default recursion limit.
+            node = ParentNode("span", [node])
+        self.assertEqual(node.to_html(), "<span>" * 5000 + "text" + "</span>" * 5000)
+
+    def test_no_children(self):
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            node.to_html()
@@ -0,0 +1,105 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from precompress import Precompressor, available_codecs, remove_sidecars
+
+
+class TestPrecompressor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.page = self.write("docs/index.html", "<p>Hello</p>" * 100)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+        return path
+
+    def read_gzip(self, path):
+        with open(path + ".gz", "rb") as f:
+            return gzip.decompress(f.read())
+
+    def run_precompressor(self, *paths, unchanged=False, protected=()):
+        precompressor = Precompressor(workers=2, protected=protected)
+        for path in paths:
+            precompressor.add(path, unchanged=unchanged)
+        self.assertEqual(precompressor.close(), [])
+        return precompressor
+
+    def test_gzip_always_available(self):
+        self.assertEqual(available_codecs()[0][0], ".gz")
+
+    def test_add_from_memory(self):
+        precompressor = Precompressor(workers=2)
+        precompressor.add(self.page, b"<p>Hello</p>" * 100)
+        precompressor.close()
+        self.assertEqual(self.read_gzip(self.page), b"<p>Hello</p>" * 100)
+        self.assertEqual(precompressor.stats, {"compressed": 1, "reused": 0, "skipped": 0})
+
+    def test_sidecars_are_deterministic(self):
+        self.run_precompressor(self.page)
+        with open(self.page + ".gz", "rb") as f:
+            first = f.read()
+        os.remove(self.page + ".gz")
+        self.run_precompressor(self.page)
+        with open(self.page + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_skips_incompressible_and_small_files(self):
+        image = self.write("docs/images/logo.png", os.urandom(1024))
+        small = self.write("docs/small.html", "<p>Hi</p>")
+        self.write("docs/small.html.gz", "stale")
+        precompressor = self.run_precompressor(image, small)
+        self.assertEqual(precompressor.stats["skipped"], 2)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp.name, "docs", "images"))), ["logo.png"])
+        self.assertFalse(os.path.exists(small + ".gz"))
+
+    def test_drops_sidecar_that_does_not_shrink(self):
+        noise = self.write("docs/noise.bin", os.urandom(4096))
+        self.run_precompressor(noise)
+        self.assertFalse(os.path.exists(noise + ".gz"))
+
+    def test_reuses_fresh_sidecar(self):
+        self.run_precompressor(self.page)
+        precompressor = self.run_precompressor(self.page, unchanged=True)
+        self.assertEqual(precompressor.stats["reused"], 1)
+        os.utime(self.page + ".gz", ns=(1, 1)) # Older than the page now.
+        precompressor = self.run_precompressor(self.page, unchanged=True)
+        self.assertEqual(precompressor.stats["compressed"], 1)
+
+    def test_sweep(self):
+        other = self.write("docs/blog/index.html", "<p>Blog</p>" * 100)
+        orphan = self.write("docs/gone/index.html.gz", "stale")
+        archive = self.write("docs/archive.tar.gz", "static file")
+        precompressor = Precompressor(workers=2, protected=[archive])
+        precompressor.add(self.page)
+        precompressor.sweep(os.path.join(self.tmp.name, "docs"))
+        self.assertEqual(precompressor.close(), [])
+        self.assertEqual(self.read_gzip(other), b"<p>Blog</p>" * 100)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(archive))
+        self.assertEqual(precompressor.stats["compressed"], 2)
+
+    def test_discard(self):
+        self.run_precompressor(self.page)
+        precompressor = Precompressor(workers=1)
+        precompressor.discard(self.page)
+        precompressor.close()
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+
+    def test_remove_sidecars(self):
+        self.run_precompressor(self.page)
+        archive = self.write("docs/archive.tar", "tar")
+        protected = self.write("docs/archive.tar.gz", "static file")
+        not_a_sidecar = self.write("docs/data.gz", "no data file next to it")
+        removed = remove_sidecars(os.path.join(self.tmp.name, "docs"), [".gz"], {protected})
+        self.assertEqual(removed, [self.page + ".gz"])
+        self.assertTrue(os.path.exists(archive) and os.path.exists(protected) and os.path.exists(not_a_sidecar))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import rendercache
+from rendercache import RENDERER_MODULES, RenderCache, renderer_version
+from fingerprint import AssetMap
+
+
+def put_entry(args):
+    path, key, html = args
+    RenderCache(path, 1 << 20, "test").put(key, html)
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cache")
+        self.cache = RenderCache(self.path, 1 << 20, "test")
+
+    def test_renderer_version(self):
+        self.assertEqual(renderer_version(), renderer_version())
+        self.assertEqual(len(renderer_version()), 16)
+
+    def test_renderer_modules_cover_link_rewriting(self):
+        for name in ("pagetemplate.py", "fingerprint.py"): # rewrite_url and AssetMap.resolve change the cached HTML.
+            self.assertIn(name, RENDERER_MODULES)
+            self.assertTrue(os.path.isfile(os.path.join(os.path.dirname(rendercache.__file__), name)))
+
+    def test_miss_then_hit(self):
+        key = self.cache.key("# Title", "/")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "<div><h1>Title</h1></div>")
+        self.assertEqual(self.cache.get(key), "<div><h1>Title</h1></div>")
+
+    def test_key(self):
+        key = self.cache.key("# Title", "/")
+        self.assertEqual(key, self.cache.key("# Title", "/"))
+        self.assertNotEqual(key, self.cache.key("# Title", "/blog/"))
+        self.assertNotEqual(key, self.cache.key("# Other", "/"))
+        self.assertNotEqual(key, self.cache.key("# Title", "/", AssetMap("static", {})))
+        self.assertNotEqual(key, RenderCache(self.path, 1 << 20, "other").key("# Title", "/"))
+
+    def test_prune_evicts_least_recently_used(self):
+        keys = [self.cache.key(f"# Page {i}", "/") for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, "x" * 100)
+            os.utime(self.cache.entry_path(key), ns=(i * 10**9, i * 10**9))
+        self.cache.get(keys[0]) # Now the most recently used.
+        self.cache.max_bytes = 250
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_prune_under_budget(self):
+        self.cache.put(self.cache.key("# Title", "/"), "x" * 100)
+        self.assertEqual(self.cache.prune(), 0)
+        self.assertEqual(RenderCache(os.path.join(self.tmp.name, "missing"), 0).prune(), 0)
+
+    def test_concurrent_writers(self):
+        key = self.cache.key("# Title", "/")
+        html = "<p>" + "x" * 100000 + "</p>"
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(put_entry, [(self.path, key, html)] * 16))
+        self.assertEqual(self.cache.get(key), html)
+        self.assertEqual(os.listdir(os.path.dirname(self.cache.entry_path(key))), [f"{key}.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+
+from manifest import hash_file
+from staging import prepare_staging, swap_output, diff_output_trees, write_deploy_manifest
+
+
+class TestStaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output = os.path.join(self.tmp.name, "docs")
+        self.staging = os.path.join(self.tmp.name, "docs.staging")
+        self.write("docs/index.html", "<h1>Home</h1>")
+        self.write("docs/blog/index.html", "<h1>Blog</h1>")
+        self.write("docs/index.css", "body {}")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as f: # Replaces rather than rewrites, like every build writer.
+            f.write(text)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def read(self, name):
+        with open(os.path.join(self.tmp.name, name)) as f:
+            return f.read()
+
+    def test_prepare_staging_links_output(self):
+        prepare_staging(self.output, self.staging)
+        live = os.stat(os.path.join(self.output, "index.html"))
+        staged = os.stat(os.path.join(self.staging, "index.html"))
+        self.assertEqual((live.st_dev, live.st_ino), (staged.st_dev, staged.st_ino))
+        self.assertEqual(self.read("docs.staging/blog/index.html"), "<h1>Blog</h1>")
+
+    def test_prepare_staging_without_seed(self):
+        self.write("docs.staging/leftover.html", "old")
+        prepare_staging(self.output, self.staging, seed=False)
+        self.assertEqual(os.listdir(self.staging), [])
+
+    def test_staged_write_leaves_output_alone(self):
+        prepare_staging(self.output, self.staging)
+        self.write("docs.staging/index.html", "<h1>New</h1>")
+        self.assertEqual(self.read("docs/index.html"), "<h1>Home</h1>")
+
+    def test_diff_output_trees(self):
+        prepare_staging(self.output, self.staging)
+        self.write("docs.staging/index.html", "<h1>New</h1>")
+        self.write("docs.staging/index.css", "body {}") # Rewritten with the same bytes.
+        self.write("docs.staging/about/index.html", "<h1>About</h1>")
+        os.remove(os.path.join(self.staging, "blog", "index.html"))
+        changes = diff_output_trees(self.output, self.staging)
+        self.assertEqual(changes["added"], {"about/index.html": hash_file(os.path.join(self.staging, "about", "index.html"))})
+        self.assertEqual(list(changes["changed"]), ["index.html"])
+        self.assertEqual(changes["removed"], ["blog/index.html"])
+        self.assertEqual(changes["unchanged"], 1)
+
+    def test_diff_output_trees_first_build(self):
+        changes = diff_output_trees(os.path.join(self.tmp.name, "missing"), self.output)
+        self.assertEqual(sorted(changes["added"]), ["blog/index.html", "index.css", "index.html"])
+
+    def test_swap_output(self):
+        prepare_staging(self.output, self.staging)
+        self.write("docs.staging/index.html", "<h1>New</h1>")
+        swap_output(self.staging, self.output)
+        self.assertEqual(self.read("docs/index.html"), "<h1>New</h1>")
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["docs"])
+
+    def test_write_deploy_manifest(self):
+        path = os.path.join(self.tmp.name, "deploy.json")
+        write_deploy_manifest(path, {"added": {"a.html": "1"}, "changed": {}, "removed": ["b.html"], "unchanged": 3})
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"version": 1, "added": {"a.html": "1"}, "changed": {}, "removed": ["b.html"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
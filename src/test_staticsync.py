@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from staticsync import sync_dir_contents, copy_file
+from fingerprint import AssetMap
+
+
+class TestStaticSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/logo.png", "png")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, name):
+        with open(os.path.join(self.tmp.name, name)) as f:
+            return f.read()
+
+    def test_first_sync_copies_everything(self):
+        files, stats = sync_dir_contents(self.source, self.dest)
+        self.assertEqual(files, ["index.css", os.path.join("images", "logo.png")])
+        self.assertEqual(stats, {"copied": 2, "unchanged": 0, "removed": 0})
+        self.assertEqual(self.read("docs/images/logo.png"), "png")
+
+    def test_on_copy_sees_copied_files_only(self):
+        sync_dir_contents(self.source, self.dest)
+        self.write("static/index.css", "body { margin: 0 }")
+        copied = []
+        sync_dir_contents(self.source, self.dest, on_copy=copied.append)
+        self.assertEqual(copied, [os.path.join(self.dest, "index.css")])
+
+    def test_noop_sync(self):
+        sync_dir_contents(self.source, self.dest)
+        _, stats = sync_dir_contents(self.source, self.dest)
+        self.assertEqual(stats, {"copied": 0, "unchanged": 2, "removed": 0})
+
+    def test_changed_file_copied(self):
+        sync_dir_contents(self.source, self.dest)
+        self.write("static/index.css", "body { margin: 0 }")
+        _, stats = sync_dir_contents(self.source, self.dest)
+        self.assertEqual(stats["copied"], 1)
+        self.assertEqual(self.read("docs/index.css"), "body { margin: 0 }")
+
+    def test_checksum_detects_same_size_change(self):
+        sync_dir_contents(self.source, self.dest)
+        path = self.write("docs/index.css", "body []")
+        stat = os.stat(os.path.join(self.source, "index.css"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        _, stats = sync_dir_contents(self.source, self.dest)
+        self.assertEqual(stats["copied"], 0)
+        _, stats = sync_dir_contents(self.source, self.dest, checksum=True)
+        self.assertEqual(stats["copied"], 1)
+        self.assertEqual(self.read("docs/index.css"), "body {}")
+
+    def test_orphans_removed_but_pages_kept(self):
+        files, _ = sync_dir_contents(self.source, self.dest)
+        self.write("docs/index.html", "<html></html>")
+        os.remove(os.path.join(self.source, "images", "logo.png"))
+        _, stats = sync_dir_contents(self.source, self.dest, files)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images", "logo.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_link(self):
+        sync_dir_contents(self.source, self.dest, link=True)
+        source_stat = os.stat(os.path.join(self.source, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        self.assertEqual(source_stat.st_ino, dest_stat.st_ino)
+
+    def test_copy_file_breaks_link(self):
+        sync_dir_contents(self.source, self.dest, link=True)
+        copy_file(os.path.join(self.source, "index.css"), os.path.join(self.dest, "index.css"))
+        source_stat = os.stat(os.path.join(self.source, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        self.assertNotEqual(source_stat.st_ino, dest_stat.st_ino)
+
+    def test_fingerprinted_copies(self):
+        assets = AssetMap.scan(self.source)
+        fingerprinted = assets.output_name("index.css")
+        files, stats = sync_dir_contents(self.source, self.dest, assets=assets)
+        self.assertIn(fingerprinted, files)
+        self.assertEqual(stats["copied"], 2)
+        self.assertEqual(self.read(os.path.join("docs", fingerprinted)), "body {}")
+        self.write("static/index.css", "body { margin: 0 }")
+        sync_dir_contents(self.source, self.dest, files, assets=AssetMap.scan(self.source))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, fingerprinted))) # The old version is an orphan now.
+
+    def test_invalid_source(self):
+        with self.assertRaises(Exception):
+            sync_dir_contents(os.path.join(self.tmp.name, "missing"), self.dest)
+
+
+if __name__ == "__main__":
+    unittest.main()
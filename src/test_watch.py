@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from watch import take_snapshot, diff_snapshots
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.content = self.write("content/index.md", "# Home")
+        self.page = self.write("content/blog/index.md", "# Blog")
+        self.template = self.write("template.html", "{{ Content }}")
+        self.paths = [os.path.join(self.tmp.name, "content"), self.template]
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_snapshot(self):
+        snapshot = take_snapshot(self.paths)
+        self.assertEqual(sorted(snapshot), sorted([self.content, self.page, self.template]))
+
+    def test_snapshot_missing_path(self):
+        self.assertEqual(take_snapshot([os.path.join(self.tmp.name, "missing")]), {})
+
+    def test_no_changes(self):
+        self.assertEqual(diff_snapshots(take_snapshot(self.paths), take_snapshot(self.paths)), ([], []))
+
+    def test_changes(self):
+        old = take_snapshot(self.paths)
+        self.write("content/blog/index.md", "# Blog, edited")
+        added = self.write("content/new/index.md", "# New")
+        os.remove(self.content)
+        changed, removed = diff_snapshots(old, take_snapshot(self.paths))
+        self.assertEqual(changed, sorted([self.page, added]))
+        self.assertEqual(removed, [self.content])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+
+def take_snapshot(paths): # Maps every file under `paths` to its (mtime, size).
+    snapshot = {}
+    pending = []
+    for path in paths:
+        if os.path.isdir(path):
+            pending.append(os.path.normpath(path))
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            snapshot[os.path.normpath(path)] = (stat.st_mtime_ns, stat.st_size)
+    while pending:
+        with os.scandir(pending.pop()) as entries: # scandir reuses directory data, which keeps polling cheap.
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def diff_snapshots(old, new): # Returns the sorted paths that were added or modified, and those that were removed.
+    changed = sorted(path for path, stat in new.items() if old.get(path) != stat)
+    removed = sorted(path for path in old if path not in new)
+    return changed, removed